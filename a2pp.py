@@ -1,13 +1,67 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
 import json
+import os
 import time
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable, Mapping, Iterator, Iterable, Set, BinaryIO, Union
 import concurrent.futures
-from dataclasses import dataclass
+import multiprocessing
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
 from pathlib import Path
+from urllib.parse import quote
 import re
+import bisect
+import hashlib
+import sqlite3
+import subprocess
+import tarfile
+import zipfile
+import io
+import sys
+from array import array
+
+import numpy as np
+
+from workflow_analysis import STICKY_NOTE_TYPE, MINHASH_PERMUTATIONS, analyze_workflow_fields, analyze_workflow_content
+
+try:
+    import aiohttp
+except ImportError:  # The asyncio fetch engine is optional
+    aiohttp = None
+
+try:
+    import ijson
+except ImportError:  # Without ijson, large workflows are parsed whole and then pruned
+    ijson = None
+
+JSON_ERRORS = (ValueError, ijson.JSONError) if ijson else (ValueError,)
+
+# Partial reruns need Streamlit 1.37+; older versions rerun the whole script on every interaction
+fragment = getattr(st, "fragment", None) or (lambda func: func)
+
+def polling_fragment(interval: float) -> Callable:
+    """Decorate a fragment that reruns on its own every interval seconds, where Streamlit supports it"""
+    if hasattr(st, "fragment"):
+        return lambda func: st.fragment(func, run_every=interval)
+    return lambda func: func
+
+def rerun_fragment() -> None:
+    """Rerun only the enclosing fragment, or the whole script where that is not possible"""
+    if hasattr(st, "fragment"):
+        try:
+            st.rerun(scope="fragment")
+        except st.errors.StreamlitAPIException:
+            # Fragment-scoped reruns are only allowed while the fragment itself is rerunning
+            pass
+    st.rerun()
 
 # Page configuration
 st.set_page_config(
@@ -17,127 +71,2108 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-@dataclass
-class WorkflowFile:
-    """Data class to represent a workflow file"""
-    name: str
-    path: str
-    size: int
-    download_url: str
-    sha: str
+# Persistent workflow cache settings
+CACHE_DIR = Path(os.environ.get("TOOLKITFLOW_CACHE_DIR", Path.home() / ".cache" / "toolkitflow"))
+CACHE_MAX_BYTES = int(os.environ.get("TOOLKITFLOW_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+CACHE_FORMAT_VERSION = 5
+CATALOG_PATH = Path(os.environ.get("TOOLKITFLOW_CATALOG_PATH", CACHE_DIR / "catalog.sqlite3"))
+CATALOG_SCHEMA_VERSION = 2
+CATALOG_QUERY_BATCH = 500  # Paths per IN (...) list, well under SQLite's bound parameter limit
+CONDITIONAL_CACHE_MAX_BYTES = 64 * 1024 * 1024
+LISTING_HEAD_TTL = 60  # Seconds a resolved branch head is trusted before it is revalidated
+LISTING_CACHE_ENTRIES = 32
+STORE_MAX_BYTES = int(os.environ.get("TOOLKITFLOW_STORE_MAX_BYTES", 128 * 1024 * 1024))
+PREPARED_DOWNLOADS_LIMIT = 20
+NODE_TYPE_MATCH_CACHE_ENTRIES = 256  # Node type filter substrings whose masks are kept
+CORPUS_STATS_SOURCES = 8  # Sources whose report columns are kept in memory
+
+# Background warming of the next result pages
+PREFETCH_PAGES = 2
+PREFETCH_WORKERS = 2
+PREFETCH_BUDGET_BYTES = int(os.environ.get("TOOLKITFLOW_PREFETCH_BUDGET_BYTES", 4 * 1024 * 1024))
+
+# On-demand analysis for node count/type filters
+RESOLVE_WORKERS = 16
+ANALYSIS_POLL_INTERVAL = 1.0  # Seconds between checks for finished analyses while filter results are partial
+
+# Near-duplicate detection: 16 bands of 4 MinHash rows catch pairs above ~0.8 similarity almost surely
+LSH_BANDS = 16
+NEAR_DUPLICATE_SIMILARITY = 0.8
+DUPLICATE_PATH_EXAMPLES = 3  # Paths listed per group in the report; the rest are only counted
+
+# Workflows above this size are reduced to the fields the analyzer needs
+LARGE_WORKFLOW_BYTES = int(os.environ.get("TOOLKITFLOW_LARGE_WORKFLOW_BYTES", 1024 * 1024))
+SUMMARY_MARKER = "__toolkitflow_summary__"
+SUMMARY_NOTE_MAX_CHARS = 4000
+
+# Analysis runs in worker processes; 0 analyzes on the script thread instead
+ANALYSIS_WORKERS = int(os.environ.get("TOOLKITFLOW_ANALYSIS_WORKERS", os.cpu_count() or 1))
+# Fetched and stored documents: raw bytes, parsed only where a dict is needed, or an already parsed summary
+WorkflowPayload = Union[bytes, Dict[str, Any]]
+
+# HTTP settings
+BATCH_WORKERS = 6
+MAX_CONCURRENCY = 64
+TRANSIENT_STATUSES = (500, 502, 503, 504)
+TRANSIENT_RETRIES = 3
+TRANSIENT_BACKOFF = 0.5  # Seconds before the first 5xx retry, doubling on each further retry
+FETCH_ENGINES = ["Threads", "Asyncio", "Archive"]
+RATE_LIMIT_MAX_WAIT = 60  # Longest rate-limit pause (seconds) before giving up
+RATE_LIMIT_RETRIES = 3
+
+# Workflow sources; local directories are only offered when the server opts in with a root to confine them to
+LOCAL_ROOT = os.environ.get("TOOLKITFLOW_LOCAL_ROOT")
+SOURCE_TYPES = ["GitHub", "Local directory"] if LOCAL_ROOT else ["GitHub"]
+DEFAULT_LOCAL_PATH = str(Path(LOCAL_ROOT).expanduser().resolve()) if LOCAL_ROOT else ""
+
+# Diagnostics
+METRICS_TRACE_FILE = os.environ.get("TOOLKITFLOW_TRACE_FILE")  # Optional JSONL file of stage timings
+METRICS_TIMING_SAMPLES = 512
+METRICS_CACHES = ("http", "listing", "store", "disk")
+
+@dataclass
+class WorkflowFile:
+    """Data class to represent a workflow file"""
+    name: str
+    path: str
+    size: int
+    download_url: str
+    sha: str
+    
+class NodeTypeVocabulary:
+    """Class to intern node type names as small integer ids shared by every analysis"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        # substring -> (vocabulary size, mask), least recently used first
+        self._match_masks: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def id_for(self, name: str) -> int:
+        type_id = self._ids.get(name)
+        if type_id is None:
+            with self._lock:
+                type_id = self._ids.get(name)
+                if type_id is None:
+                    type_id = len(self._names)
+                    self._names.append(sys.intern(name))
+                    self._ids[name] = type_id
+        return type_id
+    
+    def name(self, type_id: int) -> str:
+        return self._names[type_id]
+    
+    def mask_matching(self, substring: str) -> int:
+        """Return a bitset of every known node type whose name contains the substring"""
+        substring = substring.lower()
+        size = len(self._names)
+        with self._lock:
+            scanned, mask = self._match_masks.get(substring, (0, 0))
+            if substring in self._match_masks:
+                self._match_masks.move_to_end(substring)
+        if scanned == size:
+            return mask
+        
+        # Ids are append-only, so a cached mask only needs the node types added since
+        for type_id in range(scanned, size):
+            if substring in self._names[type_id].lower():
+                mask |= 1 << type_id
+        with self._lock:
+            self._match_masks[substring] = (size, mask)
+            self._match_masks.move_to_end(substring)
+            while len(self._match_masks) > NODE_TYPE_MATCH_CACHE_ENTRIES:
+                self._match_masks.popitem(last=False)
+        return mask
+
+@st.cache_resource
+def get_node_type_vocabulary() -> NodeTypeVocabulary:
+    """Return the process-wide node type vocabulary"""
+    return NodeTypeVocabulary()
+
+@dataclass(frozen=True, slots=True)
+class WorkflowAnalysis:
+    """Data class to represent workflow analysis, with node types stored as interned ids"""
+    name: str
+    node_count: int
+    connection_count: int
+    has_trigger: bool
+    node_type_ids: array  # Vocabulary ids in order of first appearance
+    node_type_mask: int  # Bitset of node_type_ids for membership tests
+    created_at: Optional[str]
+    updated_at: Optional[str]
+    tags: Tuple[str, ...]
+    description: Optional[str]
+    sticky_notes: Tuple[str, ...] = ()
+    max_depth: int = 0
+    cycle_count: int = 0
+    orphan_count: int = 0
+    unreachable_count: int = 0
+    max_fan_out: int = 0
+    fan_out_hotspots: Tuple[str, ...] = ()
+    structure_hash: Optional[str] = None  # Canonical hash of node types and edges, None for trivial workflows
+    minhash: array = field(default_factory=lambda: array('I'))  # MinHash signature of the structure
+    
+    @classmethod
+    def create(cls, node_types: Iterable[str], tags: Iterable[Any] = (), **fields: Any) -> "WorkflowAnalysis":
+        """Build an analysis from node type names, interning them into the shared vocabulary"""
+        vocabulary = get_node_type_vocabulary()
+        node_type_ids = array('H', dict.fromkeys(vocabulary.id_for(t) for t in node_types))
+        node_type_mask = 0
+        for type_id in node_type_ids:
+            node_type_mask |= 1 << type_id
+        
+        # n8n exports tags as objects; only their names are kept
+        tag_names = tuple(sys.intern(tag.get('name', '') if isinstance(tag, dict) else str(tag)) for tag in tags)
+        sticky_notes = tuple(fields.pop('sticky_notes', ()))
+        fan_out_hotspots = tuple(fields.pop('fan_out_hotspots', ()))
+        minhash = array('I', fields.pop('minhash', ()))
+        
+        return cls(node_type_ids=node_type_ids, node_type_mask=node_type_mask, tags=tag_names,
+                   sticky_notes=sticky_notes, fan_out_hotspots=fan_out_hotspots, minhash=minhash, **fields)
+    
+    @property
+    def node_types(self) -> List[str]:
+        vocabulary = get_node_type_vocabulary()
+        return [vocabulary.name(type_id) for type_id in self.node_type_ids]
+    
+    def has_any_node_type(self, mask: int) -> bool:
+        return bool(self.node_type_mask & mask)
+    
+    def without_notes(self) -> "WorkflowAnalysis":
+        """Return a copy without sticky note text, for records held in memory once the catalog has indexed it"""
+        return replace(self, sticky_notes=()) if self.sticky_notes else self
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize with node type names, since vocabulary ids are only stable within a process"""
+        return {
+            'name': self.name,
+            'node_count': self.node_count,
+            'connection_count': self.connection_count,
+            'has_trigger': self.has_trigger,
+            'node_types': self.node_types,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'tags': list(self.tags),
+            'description': self.description,
+            'sticky_notes': list(self.sticky_notes),
+            'max_depth': self.max_depth,
+            'cycle_count': self.cycle_count,
+            'orphan_count': self.orphan_count,
+            'unreachable_count': self.unreachable_count,
+            'max_fan_out': self.max_fan_out,
+            'fan_out_hotspots': list(self.fan_out_hotspots),
+            'structure_hash': self.structure_hash,
+            'minhash': self.minhash.tolist()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkflowAnalysis":
+        return cls.create(**data)
+
+class RateLimitError(Exception):
+    """Raised when GitHub rate limiting outlasts the allowed wait"""
+
+class Metrics:
+    """Class to collect process-wide counters and stage timings for diagnostics and export"""
+    
+    def __init__(self, trace_path: Optional[str] = METRICS_TRACE_FILE):
+        self.trace_path = trace_path
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}  # (name, labels) -> value
+        self._timings: Dict[str, Tuple[int, float, deque]] = {}  # stage -> (count, total seconds, recent samples)
+    
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def counter(self, name: str, **labels: str) -> float:
+        """Sum a counter over every label set that includes the given labels"""
+        wanted = set(labels.items())
+        with self._lock:
+            return sum(value for (counter_name, counter_labels), value in self._counters.items()
+                       if counter_name == name and wanted <= set(counter_labels))
+    
+    def hit_ratio(self, cache: str) -> Optional[float]:
+        hits = self.counter("cache_lookups", cache=cache, result="hit")
+        lookups = self.counter("cache_lookups", cache=cache)
+        return hits / lookups if lookups else None
+    
+    def observe(self, stage: str, seconds: float, **fields: Any) -> None:
+        with self._lock:
+            count, total, samples = self._timings.get(stage, (0, 0.0, deque(maxlen=METRICS_TIMING_SAMPLES)))
+            samples.append(seconds)
+            self._timings[stage] = (count + 1, total + seconds, samples)
+            if self.trace_path:
+                try:
+                    with open(self.trace_path, "a", encoding="utf-8") as trace:
+                        trace.write(json.dumps({'ts': time.time(), 'stage': stage, 'seconds': seconds, **fields}) + "\n")
+                except OSError:
+                    pass
+    
+    @contextmanager
+    def timer(self, stage: str, **fields: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, **fields)
+    
+    def stage_summary(self) -> List[Tuple[str, int, float, float, float, float]]:
+        """Return (stage, count, total, p50, p99, last) in seconds, over the recent samples of each stage"""
+        with self._lock:
+            timings = [(stage, count, total, sorted(samples), samples[-1])
+                       for stage, (count, total, samples) in self._timings.items()]
+        return [(stage, count, total, ordered[len(ordered) // 2], ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], last)
+                for stage, count, total, ordered, last in sorted(timings)]
+    
+    def prometheus(self) -> str:
+        """Render a Prometheus text-format snapshot"""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+        for name in sorted({name for (name, _), _ in counters}):
+            lines.append(f"# TYPE toolkitflow_{name}_total counter")
+            for (counter_name, labels), value in counters:
+                if counter_name == name:
+                    label_text = ",".join(f'{key}="{value_}"' for key, value_ in labels)
+                    lines.append(f"toolkitflow_{name}_total{{{label_text}}} {value:g}")
+        
+        lines.append("# TYPE toolkitflow_stage_seconds summary")
+        for stage, count, total, p50, p99, _ in self.stage_summary():
+            lines.append(f'toolkitflow_stage_seconds{{stage="{stage}",quantile="0.5"}} {p50:.6f}')
+            lines.append(f'toolkitflow_stage_seconds{{stage="{stage}",quantile="0.99"}} {p99:.6f}')
+            lines.append(f'toolkitflow_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'toolkitflow_stage_seconds_count{{stage="{stage}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+@st.cache_resource
+def get_metrics() -> Metrics:
+    """Return the process-wide metrics registry"""
+    return Metrics()
+
+class ConditionalRequestCache:
+    """Class to remember ETag/Last-Modified validators and payloads per URL"""
+    
+    def __init__(self, max_bytes: int = CONDITIONAL_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Optional[str], Optional[str], bytes]]" = OrderedDict()
+        self._total_bytes = 0
+    
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a previously seen URL"""
+        with self._lock:
+            entry = self._entries.get(url)
+        
+        headers = {}
+        if entry:
+            etag, last_modified, _ = entry
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+    
+    def get(self, url: str) -> Optional[bytes]:
+        """Return the payload stored for a URL, marking it as recently used"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            self._entries.move_to_end(url)
+            return entry[2]
+    
+    def store(self, url: str, headers: Mapping[str, str], content: bytes) -> None:
+        """Remember the validators and payload of a successful response"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        
+        if len(content) > self.max_bytes:
+            return
+        
+        with self._lock:
+            previous = self._entries.pop(url, None)
+            if previous:
+                self._total_bytes -= len(previous[2])
+            self._entries[url] = (etag, last_modified, content)
+            self._total_bytes += len(content)
+            
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
+
+@st.cache_resource
+def get_conditional_cache() -> ConditionalRequestCache:
+    """Return the process-wide HTTP validator cache"""
+    return ConditionalRequestCache()
+
+class ListingCache:
+    """Class to cache repository listings per (owner, repo, commit SHA, path), shared by every session"""
+    
+    def __init__(self, max_entries: int = LISTING_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._heads: Dict[Tuple[str, str, str], Tuple[float, str]] = {}  # (owner, repo, branch) -> (resolved at, commit)
+        # (owner, repo, commit or branch, path) -> (expires at, files), least recently used first
+        self._listings: "OrderedDict[Tuple[str, str, str, str], Tuple[float, List[WorkflowFile]]]" = OrderedDict()
+    
+    def head(self, owner: str, repo: str, branch: str) -> Optional[str]:
+        """Return the commit a branch was last resolved to, if that was recent enough to trust"""
+        with self._lock:
+            entry = self._heads.get((owner, repo, branch))
+        if entry and time.monotonic() - entry[0] < LISTING_HEAD_TTL:
+            return entry[1]
+        return None
+    
+    def set_head(self, owner: str, repo: str, branch: str, commit_sha: str) -> None:
+        with self._lock:
+            self._heads[(owner, repo, branch)] = (time.monotonic(), commit_sha)
+    
+    def get(self, key: Tuple[str, str, str, str]) -> Optional[List[WorkflowFile]]:
+        with self._lock:
+            entry = self._listings.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._listings[key]
+                return None
+            self._listings.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key: Tuple[str, str, str, str], files: List[WorkflowFile], ttl: Optional[float] = None) -> None:
+        """Store a listing; listings of a commit never change, so they only expire when given a ttl"""
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        with self._lock:
+            self._listings[key] = (expires_at, files)
+            self._listings.move_to_end(key)
+            while len(self._listings) > self.max_entries:
+                self._listings.popitem(last=False)
+    
+    def invalidate(self, owner: str, repo: str) -> None:
+        """Forget every branch head and listing of one repository"""
+        with self._lock:
+            for head in [head for head in self._heads if head[:2] == (owner, repo)]:
+                del self._heads[head]
+            for key in [key for key in self._listings if key[:2] == (owner, repo)]:
+                del self._listings[key]
+
+@st.cache_resource
+def get_listing_cache() -> ListingCache:
+    """Return the process-wide repository listing cache"""
+    return ListingCache()
+
+@st.cache_resource
+def get_http_session(pool_size: int = BATCH_WORKERS) -> requests.Session:
+    """Return a shared, connection-pooled HTTP session with retries for transient errors"""
+    retry = Retry(
+        total=TRANSIENT_RETRIES,
+        backoff_factor=TRANSIENT_BACKOFF,
+        status_forcelist=TRANSIENT_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": "Toolkitflow"})
+    return session
+
+@st.cache_resource
+def get_analysis_pool() -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    """Return the process-wide analysis worker pool, or None to analyze on the script thread"""
+    if ANALYSIS_WORKERS <= 0:
+        return None
+    # Forking the multi-threaded Streamlit server is unsafe, so workers come from a clean forkserver
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    try:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS, mp_context=context)
+    except (OSError, NotImplementedError):
+        return None
+
+def discard_analysis_pool(pool: concurrent.futures.ProcessPoolExecutor) -> None:
+    """Shut down a pool broken by a crashed worker and forget it, so the next run starts a fresh one"""
+    pool.shutdown(wait=False, cancel_futures=True)
+    if get_analysis_pool() is pool:
+        get_analysis_pool.clear()
+
+class WorkflowSource(ABC):
+    """Base class for places workflow files can be listed and read from"""
+    
+    @abstractmethod
+    def get_all_json_files(self, path: str = "") -> List[WorkflowFile]:
+        """List all .json files in the source"""
+    
+    @abstractmethod
+    def fetch_workflow_content(self, file: WorkflowFile) -> Optional[Dict[str, Any]]:
+        """Read and parse a workflow file"""
+    
+    @abstractmethod
+    def fetch_raw_text(self, file: WorkflowFile) -> Optional[str]:
+        """Read the raw text of a file without parsing it"""
+    
+    @abstractmethod
+    def fetch_workflow_bytes(self, file: WorkflowFile) -> Optional[bytes]:
+        """Read the undecoded bytes of a workflow file, so parsing can happen off the script thread"""
+    
+    def get_raw_url(self, file: WorkflowFile) -> str:
+        """Return a location the raw file can be opened from"""
+        return file.download_url
+    
+    def invalidate_listing(self) -> None:
+        """Drop any cached listing so the next scan reads the source again"""
+    
+    @property
+    @abstractmethod
+    def source_key(self) -> str:
+        """Stable identifier for this source, used to scope shared catalog entries"""
+
+class GitHubRepository(WorkflowSource):
+    """Class to handle GitHub repository operations"""
+    
+    def __init__(self, owner: str, repo: str, branch: str = "main", token: Optional[str] = None,
+                 pool_size: int = BATCH_WORKERS):
+        self.owner = owner
+        self.repo = repo
+        self.branch = branch
+        self.api_base_url = f"https://api.github.com/repos/{owner}/{repo}"
+        self.raw_base_url = f"https://raw.githubusercontent.com/{owner}/{repo}"
+        self.token = token or os.environ.get("GITHUB_TOKEN")
+        self.session = get_http_session(pool_size)
+        self.conditional_cache = get_conditional_cache()
+        self.listing_cache = get_listing_cache()
+        self.metrics = get_metrics()
+        self.listed_ref: Optional[str] = None  # Commit, or branch if unresolved, of the last listing
+        
+        # Last rate-limit state reported by the API
+        self._rate_limit_lock = threading.Lock()
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: Optional[float] = None
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        return {'Authorization': f"Bearer {self.token}"} if self.token else {}
+    
+    def _rate_limit_wait(self, status_code: int, headers: Mapping[str, str], attempt: int) -> Optional[float]:
+        """Return how long to wait before retrying a rate-limited response, or None if it is not one"""
+        if status_code not in (403, 429):
+            return None
+        
+        retry_after = headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        
+        if headers.get('X-RateLimit-Remaining') == '0':
+            reset = headers.get('X-RateLimit-Reset', '')
+            return max(float(reset) - time.time(), 1.0) if reset.isdigit() else float(RATE_LIMIT_MAX_WAIT)
+        
+        if status_code == 429:
+            return float(2 ** attempt)
+        
+        return None
+    
+    def _record_rate_limit(self, headers: Mapping[str, str]) -> None:
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or not remaining.isdigit():
+            return
+        
+        with self._rate_limit_lock:
+            self.rate_limit_remaining = int(remaining)
+            self.rate_limit_reset = float(reset) if reset and reset.isdigit() else None
+    
+    def _rate_limit_pause(self) -> float:
+        """Return how long to pause before the next request when the last response exhausted the rate limit"""
+        with self._rate_limit_lock:
+            if self.rate_limit_remaining != 0 or self.rate_limit_reset is None:
+                return 0.0
+            wait = self.rate_limit_reset - time.time()
+        
+        if wait > RATE_LIMIT_MAX_WAIT:
+            raise RateLimitError(f"GitHub rate limit exhausted; resets in {wait / 60:.0f} min. Add a token to raise the limit.")
+        return max(wait, 0.0)
+    
+    def _record_response(self, url: str, status: int, size: int) -> None:
+        endpoint = "api" if url.startswith(self.api_base_url) else "raw"
+        self.metrics.inc("http_requests", endpoint=endpoint, status=str(status))
+        self.metrics.inc("http_bytes", size, endpoint=endpoint)
+    
+    def _wait_for_rate_limit(self) -> None:
+        pause = self._rate_limit_pause()
+        if pause:
+            time.sleep(pause)
+    
+    def _get(self, url: str, timeout: int, headers: Optional[Dict[str, str]] = None,
+             stream: bool = False) -> requests.Response:
+        """GET a URL through the pooled session, waiting out rate limits"""
+        request_headers = {**self._auth_headers(), **(headers or {})}
+        
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self._wait_for_rate_limit()
+            response = self.session.get(url, headers=request_headers, timeout=timeout, stream=stream)
+            self._record_rate_limit(response.headers)
+            # Streamed bodies are not read yet, so count what the server announced
+            size = int(response.headers.get('Content-Length', 0) or 0) if stream else len(response.content)
+            self._record_response(url, response.status_code, size)
+            
+            wait = self._rate_limit_wait(response.status_code, response.headers, attempt)
+            if wait is None:
+                return response
+            # Release the pooled connection, which an unread streamed body would otherwise hold
+            response.close()
+            if wait > RATE_LIMIT_MAX_WAIT or attempt == RATE_LIMIT_RETRIES:
+                raise RateLimitError(f"GitHub rate limit reached; retry in {wait / 60:.0f} min or add a token to raise the limit.")
+            time.sleep(wait)
+        
+        return response
+    
+    def _conditional_get(self, url: str, timeout: int, headers: Optional[Dict[str, str]] = None) -> Optional[bytes]:
+        """GET a URL, revalidating any stored copy; 304 responses are served from the cache"""
+        response = self._get(url, timeout, {**(headers or {}), **self.conditional_cache.request_headers(url)})
+        
+        if response.status_code == 304:
+            cached = self.conditional_cache.get(url)
+            if cached is not None:
+                self.metrics.inc("cache_lookups", cache="http", result="hit")
+                return cached
+            # The stored payload was evicted, so fetch it again unconditionally
+            response = self._get(url, timeout, headers)
+        
+        if response.status_code != 200:
+            return None
+        
+        self.metrics.inc("cache_lookups", cache="http", result="miss")
+        
+        self.conditional_cache.store(url, response.headers, response.content)
+        return response.content
+    
+    async def _fetch_bytes_async(self, http: "aiohttp.ClientSession", url: str) -> Optional[bytes]:
+        """Asyncio counterpart of _conditional_get with the same revalidation, 5xx and rate-limit handling"""
+        conditional = True
+        attempt = 0  # Rate-limit retries
+        server_errors = 0
+        
+        while True:
+            pause = self._rate_limit_pause()
+            if pause:
+                await asyncio.sleep(pause)
+            
+            headers = self._auth_headers()
+            if conditional:
+                headers.update(self.conditional_cache.request_headers(url))
+            
+            async with http.get(url, headers=headers) as response:
+                self._record_rate_limit(response.headers)
+                
+                if response.status == 304:
+                    self._record_response(url, response.status, 0)
+                    cached = self.conditional_cache.get(url)
+                    if cached is not None:
+                        self.metrics.inc("cache_lookups", cache="http", result="hit")
+                        return cached
+                    if not conditional:
+                        return None
+                    # The stored payload was evicted, so fetch it again unconditionally
+                    conditional = False
+                    continue
+                
+                if response.status == 200:
+                    content = await response.read()
+                    self._record_response(url, response.status, len(content))
+                    self.metrics.inc("cache_lookups", cache="http", result="miss")
+                    self.conditional_cache.store(url, response.headers, content)
+                    return content
+                
+                self._record_response(url, response.status, 0)
+                if response.status in TRANSIENT_STATUSES:
+                    # The same bounded backoff the pooled session's urllib3 Retry applies
+                    if server_errors == TRANSIENT_RETRIES:
+                        return None
+                    wait = TRANSIENT_BACKOFF * 2 ** server_errors
+                    server_errors += 1
+                else:
+                    wait = self._rate_limit_wait(response.status, response.headers, attempt)
+                    if wait is None:
+                        return None
+                    if wait > RATE_LIMIT_MAX_WAIT or attempt == RATE_LIMIT_RETRIES:
+                        raise RateLimitError(f"GitHub rate limit reached; retry in {wait / 60:.0f} min or add a token to raise the limit.")
+                    attempt += 1
+            
+            await asyncio.sleep(wait)
+    
+    async def _fetch_workflows_async(self, files: List[WorkflowFile], concurrency: int,
+                                     on_result: Callable[[WorkflowFile, Optional[WorkflowPayload], Optional[Exception]], None]) -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=30)
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={"User-Agent": "Toolkitflow"}) as http:
+            async def fetch(file: WorkflowFile) -> Tuple[WorkflowFile, Optional[WorkflowPayload], Optional[Exception]]:
+                async with semaphore:
+                    try:
+                        content = await self._fetch_bytes_async(http, file.download_url)
+                        if content is None or len(content) <= LARGE_WORKFLOW_BYTES:
+                            return file, content, None
+                        return file, WorkflowAnalyzer.parse_workflow(io.BytesIO(content), len(content)), None
+                    except RateLimitError:
+                        raise
+                    except Exception as e:
+                        return file, None, e
+            
+            tasks = [asyncio.ensure_future(fetch(file)) for file in files]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    on_result(*(await next_done))
+            finally:
+                for task in tasks:
+                    task.cancel()
+    
+    def fetch_workflows_async(self, files: List[WorkflowFile], concurrency: int,
+                              on_result: Callable[[WorkflowFile, Optional[WorkflowPayload], Optional[Exception]], None]) -> None:
+        """Fetch many workflow files on an asyncio event loop, reporting each result as it completes"""
+        if aiohttp is None:
+            raise RuntimeError("The asyncio fetch engine requires the aiohttp package")
+        asyncio.run(self._fetch_workflows_async(files, concurrency, on_result))
+    
+    def iter_archive_json_files(self) -> Iterator[Tuple[str, int, BinaryIO]]:
+        """Stream the tarball of the last listed commit once, yielding (path, size, stream) for every .json member
+        
+        Each member stream must be consumed before the iterator is advanced.
+        """
+        # Pinned like the raw URLs, so the archive holds the blobs the listing named
+        url = f"{self.api_base_url}/tarball/{quote(self.listed_ref or self.branch, safe='')}"
+        response = self._get(url, timeout=60, stream=True)
+        
+        with response:
+            if response.status_code != 200:
+                raise requests.HTTPError(f"Archive download failed with status {response.status_code}", response=response)
+            
+            response.raw.decode_content = True
+            # Stream mode reads members sequentially without buffering the archive or touching disk
+            with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                for member in archive:
+                    if not member.isfile() or not member.name.endswith('.json'):
+                        continue
+                    
+                    # Members are prefixed with a generated "<owner>-<repo>-<sha>/" directory
+                    _, _, path = member.name.partition('/')
+                    extracted = archive.extractfile(member)
+                    if path and extracted is not None:
+                        yield path, member.size, extracted
+    
+    def _resolve_head(self) -> Optional[str]:
+        """Return the commit SHA the branch points to, or None if it cannot be resolved"""
+        commit_sha = self.listing_cache.head(self.owner, self.repo, self.branch)
+        if commit_sha is None:
+            # The SHA media type returns just the commit id, and unchanged heads come back as a 304
+            content = self._conditional_get(f"{self.api_base_url}/commits/{quote(self.branch, safe='')}", timeout=10,
+                                            headers={"Accept": "application/vnd.github.sha"})
+            commit_sha = content.decode("ascii", "replace").strip() if content else ""
+            if not re.fullmatch(r"[0-9a-f]{40}", commit_sha):
+                return None
+            self.listing_cache.set_head(self.owner, self.repo, self.branch, commit_sha)
+        return commit_sha
+    
+    def get_all_json_files(self, path: str = "") -> List[WorkflowFile]:
+        """Fetch all .json files from the repository"""
+        try:
+            # Listings are keyed on the commit, so several repositories and branches stay warm at once
+            commit_sha = self._resolve_head()
+            self.listed_ref = commit_sha or self.branch
+            key = (self.owner, self.repo, self.listed_ref, path)
+            json_files = self.listing_cache.get(key)
+            self.metrics.inc("cache_lookups", cache="listing", result="miss" if json_files is None else "hit")
+            if json_files is not None:
+                return json_files
+            
+            # A single recursive tree request covers the whole branch
+            json_files = self._get_json_files_from_tree(path, self.listed_ref)
+            
+            # Fall back to walking directories when the tree listing is unavailable or truncated
+            if json_files is None:
+                json_files = self._walk_contents(path, self.listed_ref)
+            
+            json_files = sorted(json_files, key=lambda x: x.name.lower())
+            # Without a commit to pin it to, a branch listing is only trusted as long as a branch head
+            self.listing_cache.put(key, json_files, ttl=None if commit_sha else LISTING_HEAD_TTL)
+            return json_files
+            
+        except RateLimitError:
+            # Propagate so an empty listing is not cached as the result
+            raise
+        except Exception as e:
+            st.error(f"Error fetching files from GitHub: {str(e)}")
+            return []
+    
+    def _get_json_files_from_tree(self, path: str = "", ref: Optional[str] = None) -> Optional[List[WorkflowFile]]:
+        """List .json files via the Git Trees API, or None if the tree is truncated"""
+        url = f"{self.api_base_url}/git/trees/{quote(ref or self.branch, safe='')}?recursive=1"
+        content = self._conditional_get(url, timeout=15)
+        
+        if content is None:
+            return None
+        
+        tree = json.loads(content)
+        if tree.get('truncated'):
+            return None
+        
+        prefix = f"{path.strip('/')}/" if path.strip('/') else ""
+        json_files = []
+        
+        for item in tree.get('tree', []):
+            item_path = item['path']
+            if item['type'] == 'blob' and item_path.endswith('.json') and item_path.startswith(prefix):
+                json_files.append(WorkflowFile(
+                    name=item_path.rsplit('/', 1)[-1],
+                    path=item_path,
+                    size=item.get('size', 0),
+                    # Pinned to the listed commit, so a later push cannot change what a listed SHA downloads
+                    download_url=f"{self.raw_base_url}/{ref or self.branch}/{quote(item_path)}",
+                    sha=item['sha']
+                ))
+        
+        return json_files
+    
+    def _walk_contents(self, path: str = "", ref: Optional[str] = None) -> List[WorkflowFile]:
+        """Recursively list .json files with one Contents API request per directory"""
+        json_files = []
+        
+        ref = ref or self.branch
+        url = f"{self.api_base_url}/contents/{path}?ref={quote(ref, safe='')}"
+        content = self._conditional_get(url, timeout=10)
+        
+        if content is not None:
+            items = json.loads(content)
+            
+            for item in items:
+                if item['type'] == 'file' and item['name'].endswith('.json'):
+                    json_files.append(WorkflowFile(
+                        name=item['name'],
+                        path=item['path'],
+                        size=item['size'],
+                        download_url=item['download_url'],
+                        sha=item['sha']
+                    ))
+                elif item['type'] == 'dir':
+                    # Recursively get files from subdirectories
+                    json_files.extend(self._walk_contents(item['path'], ref))
+        
+        return json_files
+    
+    def fetch_raw_text(self, file: WorkflowFile) -> Optional[str]:
+        """Fetch the raw text of a file without parsing it"""
+        try:
+            response = self._get(file.download_url, timeout=15)
+            return response.text if response.status_code == 200 else None
+        except (RateLimitError, requests.RequestException):
+            return None
+    
+    def fetch_workflow_content(self, file: WorkflowFile) -> Optional[Dict[str, Any]]:
+        """Fetch workflow content from a file"""
+        try:
+            # Large documents are summarized straight off the socket instead of being buffered
+            if file.size > LARGE_WORKFLOW_BYTES:
+                with self._get(file.download_url, timeout=30, stream=True) as response:
+                    if response.status_code != 200:
+                        return None
+                    response.raw.decode_content = True
+                    return WorkflowAnalyzer.parse_workflow(response.raw, file.size)
+            
+            content = self._conditional_get(file.download_url, timeout=15)
+            if content is not None:
+                return json.loads(content)
+            return None
+        except RateLimitError:
+            raise
+        except Exception as e:
+            st.error(f"Error fetching {file.name}: {str(e)}")
+            return None
+    
+    def fetch_workflow_bytes(self, file: WorkflowFile) -> Optional[bytes]:
+        return self._conditional_get(file.download_url, timeout=15)
+    
+    def invalidate_listing(self) -> None:
+        self.listing_cache.invalidate(self.owner, self.repo)
+    
+    @property
+    def source_key(self) -> str:
+        return f"github:{self.owner}/{self.repo}@{self.branch}"
+
+class LocalWorkflowSource(WorkflowSource):
+    """Class to read workflow files from a local directory or git checkout"""
+    
+    # Blob hashes memoized by absolute path, reused while size and mtime are unchanged
+    _blob_sha_memo: Dict[str, Tuple[int, int, str]] = {}
+    _memo_lock = threading.Lock()
+    
+    def __init__(self, root: str):
+        self.root = Path(root).expanduser().resolve()
+        self.listing_cache = get_listing_cache()
+        self.metrics = get_metrics()
+    
+    @staticmethod
+    def compute_blob_sha(content: bytes) -> str:
+        """Hash content the way git hashes blobs, so SHAs match the GitHub source"""
+        return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+    
+    def _git_index_shas(self) -> Dict[str, str]:
+        """Return blob SHAs from the git index for tracked files that are unmodified in the worktree"""
+        try:
+            staged = subprocess.run(["git", "-C", str(self.root), "ls-files", "-s", "-z"],
+                                    capture_output=True, timeout=30, check=True).stdout
+            modified = subprocess.run(["git", "-C", str(self.root), "diff", "--name-only", "--relative", "-z"],
+                                      capture_output=True, timeout=30, check=True).stdout
+        except (OSError, subprocess.SubprocessError):
+            return {}
+        
+        modified_paths = set(modified.decode("utf-8", "replace").split("\0"))
+        index_shas = {}
+        for entry in staged.decode("utf-8", "replace").split("\0"):
+            # Entries look like "<mode> <sha> <stage>\t<path>"
+            meta, _, path = entry.partition("\t")
+            fields = meta.split()
+            if len(fields) == 3 and path.endswith('.json') and path not in modified_paths:
+                index_shas[path] = fields[1]
+        return index_shas
+    
+    def _blob_sha(self, file_path: Path, stat: os.stat_result) -> str:
+        key = str(file_path)
+        with self._memo_lock:
+            memo = self._blob_sha_memo.get(key)
+        if memo and memo[0] == stat.st_size and memo[1] == stat.st_mtime_ns:
+            return memo[2]
+        
+        sha = self.compute_blob_sha(file_path.read_bytes())
+        with self._memo_lock:
+            self._blob_sha_memo[key] = (stat.st_size, stat.st_mtime_ns, sha)
+        return sha
+    
+    def _listing_version(self) -> str:
+        """Return the HEAD commit plus the root directory mtime, which change whenever a listing can"""
+        commit_sha = ""
+        if (self.root / ".git").exists():
+            try:
+                commit_sha = subprocess.run(["git", "-C", str(self.root), "rev-parse", "HEAD"],
+                                            capture_output=True, timeout=10, check=True).stdout.decode().strip()
+            except (OSError, subprocess.SubprocessError):
+                pass
+        return f"{commit_sha}:{self.root.stat().st_mtime_ns}"
+    
+    def get_all_json_files(self, path: str = "") -> List[WorkflowFile]:
+        """Scan the directory tree for .json files, skipping hidden directories"""
+        start = self.root / path
+        if not start.is_dir():
+            st.error(f"Local directory not found: {start}")
+            return []
+        
+        # Edits below the root leave its mtime alone, so listings also expire like an unpinned branch listing
+        key = ("local", str(self.root), self._listing_version(), path)
+        json_files = self.listing_cache.get(key)
+        self.metrics.inc("cache_lookups", cache="listing", result="miss" if json_files is None else "hit")
+        if json_files is None:
+            json_files = self._scan(start)
+            self.listing_cache.put(key, json_files, ttl=LISTING_HEAD_TTL)
+        return json_files
+    
+    def _scan(self, start: Path) -> List[WorkflowFile]:
+        index_shas = self._git_index_shas() if (self.root / ".git").exists() else {}
+        # The app's own cache may sit inside the scanned tree, and its files are not workflows
+        cache_dir = CACHE_DIR.expanduser().resolve()
+        json_files = []
+        pending_dirs = [start]
+        
+        while pending_dirs:
+            directory = pending_dirs.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if Path(entry.path) != cache_dir:
+                        pending_dirs.append(Path(entry.path))
+                elif entry.is_file() and entry.name.endswith('.json'):
+                    file_path = Path(entry.path)
+                    relative_path = file_path.relative_to(self.root).as_posix()
+                    stat = entry.stat()
+                    sha = index_shas.get(relative_path) or self._blob_sha(file_path, stat)
+                    json_files.append(WorkflowFile(
+                        name=entry.name,
+                        path=relative_path,
+                        size=stat.st_size,
+                        download_url=file_path.as_uri(),
+                        sha=sha
+                    ))
+        
+        return sorted(json_files, key=lambda x: x.name.lower())
+    
+    def fetch_raw_text(self, file: WorkflowFile) -> Optional[str]:
+        try:
+            return (self.root / file.path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+    
+    def fetch_workflow_content(self, file: WorkflowFile) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.root / file.path, "rb") as f:
+                return WorkflowAnalyzer.parse_workflow(f, file.size)
+        except (OSError,) + JSON_ERRORS as e:
+            st.error(f"Error reading {file.name}: {str(e)}")
+            return None
+    
+    def fetch_workflow_bytes(self, file: WorkflowFile) -> Optional[bytes]:
+        return (self.root / file.path).read_bytes()
+    
+    def get_raw_url(self, file: WorkflowFile) -> str:
+        return str(self.root / file.path)
+    
+    def invalidate_listing(self) -> None:
+        self.listing_cache.invalidate("local", str(self.root))
+    
+    @property
+    def source_key(self) -> str:
+        return f"local:{self.root}"
+
+class BlobHashingReader:
+    """Class to compute a stream's git blob SHA while it is read, for content too large to hash separately"""
+    
+    def __init__(self, stream: BinaryIO, size: int):
+        self._stream = stream
+        self._hash = hashlib.sha1(b"blob %d\0" % size)
+    
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        self._hash.update(chunk)
+        return chunk
+    
+    def hexdigest(self) -> str:
+        """Return the blob SHA, reading whatever the parser left unread"""
+        while self.read(1024 * 1024):
+            pass
+        return self._hash.hexdigest()
+
+def resolve_local_path(path: str) -> Optional[str]:
+    """Resolve a requested directory against LOCAL_ROOT, or None if local sources are off or it escapes the root"""
+    if not LOCAL_ROOT:
+        return None
+    root = Path(DEFAULT_LOCAL_PATH)
+    # Resolving follows symlinks and "..", so the containment check sees the directory actually read
+    resolved = (root / Path(path).expanduser()).resolve()
+    return str(resolved) if resolved.is_relative_to(root) else None
+
+class WorkflowCache:
+    """Class to persist parsed workflows and their analyses on disk, keyed by git blob SHA"""
+    
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # sha -> size, least recently used first
+        self._total_bytes = 0
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+    
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from the files already on disk"""
+        entries = []
+        for entry_path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, entry_path.stem, stat.st_size))
+        
+        for _, sha, size in sorted(entries):
+            self._entries[sha] = size
+            self._total_bytes += size
+        
+        with self._lock:
+            self._evict()
+    
+    def _path(self, sha: str) -> Path:
+        return self.cache_dir / sha[:2] / f"{sha}.json"
+    
+    @staticmethod
+    def _is_valid_sha(sha: str) -> bool:
+        return bool(sha) and re.fullmatch(r"[0-9a-f]{40,64}", sha) is not None
+    
+    def get(self, sha: str) -> Optional[Tuple[WorkflowPayload, Optional[WorkflowAnalysis]]]:
+        """Return the cached workflow and analysis for a blob SHA, if present"""
+        with self._lock:
+            if not self._has_entry(sha):
+                return None
+            self._entries.move_to_end(sha)
+        
+        entry_path = self._path(sha)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            # Raw documents are kept as text and only parsed when a caller needs the dict
+            raw = entry.get('raw')
+            workflow_data = raw.encode("utf-8") if isinstance(raw, str) else entry['workflow']
+            os.utime(entry_path)  # Keep LRU order across restarts
+        except (OSError, ValueError, KeyError, TypeError):
+            # Unreadable, corrupt or foreign entries are dropped and treated as a miss
+            self.discard(sha)
+            return None
+        
+        # Analyses written by an older format are recomputed by the caller
+        analysis = None
+        if entry.get('version') == CACHE_FORMAT_VERSION and entry.get('analysis'):
+            analysis = WorkflowAnalysis.from_dict(entry['analysis'])
+        
+        return workflow_data, analysis
+    
+    def __contains__(self, sha: str) -> bool:
+        with self._lock:
+            return self._has_entry(sha)
+    
+    def _has_entry(self, sha: str) -> bool:
+        """Whether an entry exists, adopting ones another process such as the indexer wrote (lock held)"""
+        if sha in self._entries:
+            return True
+        if not self._is_valid_sha(sha):
+            return False
+        try:
+            size = self._path(sha).stat().st_size
+        except OSError:
+            return False
+        # Adopted entries count against this process's budget too, so shared use stays near max_bytes
+        self._entries[sha] = size
+        self._total_bytes += size
+        self._evict()
+        return sha in self._entries
+    
+    def put(self, sha: str, workflow_data: WorkflowPayload, analysis: WorkflowAnalysis) -> None:
+        """Store a workflow and its analysis under its blob SHA"""
+        if not self._is_valid_sha(sha):
+            return
+        
+        entry_path = self._path(sha)
+        try:
+            document = ({'raw': workflow_data.decode("utf-8")} if isinstance(workflow_data, bytes)
+                        else {'workflow': workflow_data})
+        except UnicodeDecodeError:
+            document = {'workflow': json.loads(workflow_data)}
+        payload = json.dumps({
+            'version': CACHE_FORMAT_VERSION,
+            **document,
+            'analysis': analysis.to_dict()
+        }).encode("utf-8")
+        
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            return
+        
+        with self._lock:
+            self._total_bytes += len(payload) - self._entries.pop(sha, 0)
+            self._entries[sha] = len(payload)
+            self._evict()
+    
+    def discard(self, sha: str) -> None:
+        """Remove a single entry from the cache"""
+        with self._lock:
+            self._total_bytes -= self._entries.pop(sha, 0)
+        try:
+            self._path(sha).unlink()
+        except OSError:
+            pass
+    
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits its size budget (lock held)"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            sha, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(sha).unlink()
+            except OSError:
+                pass
+
+@st.cache_resource
+def get_workflow_cache() -> WorkflowCache:
+    """Return the process-wide persistent workflow cache"""
+    return WorkflowCache()
+
+class WorkflowAnalyzer:
+    """Class to analyze n8n workflow data"""
+    
+    SUMMARY_FIELDS = ('id', 'name', 'createdAt', 'updatedAt', 'tags', 'notes', 'description')
+    STICKY_NOTE_TYPE = STICKY_NOTE_TYPE
+    
+    @staticmethod
+    def is_summary(workflow_data: WorkflowPayload) -> bool:
+        """Whether a document is a reduced summary rather than the full workflow"""
+        return isinstance(workflow_data, dict) and bool(workflow_data.get(SUMMARY_MARKER))
+    
+    @staticmethod
+    def parse_document(workflow_data: WorkflowPayload) -> Dict[str, Any]:
+        """Return a stored document as a dict, parsing raw bytes on demand"""
+        return json.loads(workflow_data) if isinstance(workflow_data, bytes) else workflow_data
+    
+    @classmethod
+    def _summarize_node(cls, node: Dict[str, Any]) -> Dict[str, Any]:
+        summary = {'name': node.get('name'), 'type': node.get('type', 'unknown')}
+        if summary['type'] == cls.STICKY_NOTE_TYPE:
+            content = (node.get('parameters') or {}).get('content')
+            if content:
+                summary['parameters'] = {'content': content[:SUMMARY_NOTE_MAX_CHARS]}
+        return summary
+    
+    @classmethod
+    def summarize(cls, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a parsed workflow to the fields analysis needs, dropping pinData, staticData and parameters"""
+        summary = {key: workflow_data[key] for key in cls.SUMMARY_FIELDS if key in workflow_data}
+        summary['nodes'] = [cls._summarize_node(node) for node in workflow_data.get('nodes') or []]
+        summary['connections'] = workflow_data.get('connections') or {}
+        summary[SUMMARY_MARKER] = True
+        return summary
+    
+    @classmethod
+    def _summarize_stream(cls, stream: BinaryIO) -> Dict[str, Any]:
+        """Build a summary in one pass over JSON events, never materializing unneeded subtrees"""
+        summary: Dict[str, Any] = {'nodes': [], 'connections': {}, SUMMARY_MARKER: True}
+        builder = None  # Collects a whitelisted subtree (tags, connections)
+        builder_key = None
+        depth = 0
+        node: Optional[Dict[str, Any]] = None
+        
+        for prefix, event, value in ijson.parse(stream, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                depth += {'start_map': 1, 'start_array': 1, 'end_map': -1, 'end_array': -1}.get(event, 0)
+                if depth == 0:
+                    summary[builder_key] = builder.value
+                    builder = None
+                continue
+            
+            if prefix in ('tags', 'connections') and event in ('start_map', 'start_array'):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                builder_key = prefix
+                depth = 1
+            elif prefix in cls.SUMMARY_FIELDS and event in ('string', 'number', 'boolean', 'null'):
+                summary[prefix] = value
+            elif prefix == 'nodes.item' and event == 'start_map':
+                node = {}
+            elif prefix in ('nodes.item.name', 'nodes.item.type') and node is not None:
+                node[prefix.rsplit('.', 1)[-1]] = value
+            elif prefix == 'nodes.item.parameters.content' and event == 'string' and node is not None:
+                node['parameters'] = {'content': value[:SUMMARY_NOTE_MAX_CHARS]}
+            elif prefix == 'nodes.item' and event == 'end_map' and node is not None:
+                summary['nodes'].append(cls._summarize_node(node))
+                node = None
+        
+        return summary
+    
+    @classmethod
+    def parse_workflow(cls, stream: BinaryIO, size: int) -> Dict[str, Any]:
+        """Parse a workflow document, summarizing large ones so they never stay resident in full"""
+        if size <= LARGE_WORKFLOW_BYTES:
+            return json.load(stream)
+        if ijson is not None:
+            return cls._summarize_stream(stream)
+        return cls.summarize(json.load(stream))
+    
+    @classmethod
+    def analyze_workflow(cls, workflow_data: WorkflowPayload) -> WorkflowAnalysis:
+        """Analyze workflow data and extract insights"""
+        return WorkflowAnalysis.create(**analyze_workflow_fields(cls.parse_document(workflow_data)))
+
+class SearchIndex:
+    """Class to maintain an inverted index over workflow metadata for token and prefix search"""
+    
+    FILE_FIELDS = ('name', 'path')
+    ANALYSIS_FIELDS = ('workflow', 'node_type', 'tag', 'note', 'description')
+    
+    def __init__(self):
+        fields = self.FILE_FIELDS + self.ANALYSIS_FIELDS
+        self._postings: Dict[str, Dict[str, Set[str]]] = {f: {} for f in fields}  # field -> token -> keys
+        self._sorted_tokens: Dict[str, List[str]] = {f: [] for f in fields}  # field -> tokens, for prefix lookup
+        self._doc_tokens: Dict[str, Dict[str, Set[str]]] = {}  # key -> field -> tokens, for removal
+        self._file_shas: Dict[str, str] = {}
+    
+    @staticmethod
+    def tokenize(text: str) -> Set[str]:
+        """Split text into lowercase word tokens, adding camelCase parts (httpRequest -> http, request)"""
+        tokens = set()
+        for word in re.findall(r"[A-Za-z0-9]+", text or ""):
+            tokens.add(word.lower())
+            parts = re.findall(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|[0-9]+", word)
+            if len(parts) > 1:
+                tokens.update(part.lower() for part in parts)
+        return tokens
+    
+    def _add(self, key: str, field_name: str, texts: Iterable[str]) -> None:
+        tokens = set()
+        for text in texts:
+            tokens |= self.tokenize(text)
+        
+        postings = self._postings[field_name]
+        sorted_tokens = self._sorted_tokens[field_name]
+        for token in tokens:
+            if token not in postings:
+                postings[token] = set()
+                bisect.insort(sorted_tokens, token)
+            postings[token].add(key)
+        
+        self._doc_tokens.setdefault(key, {})[field_name] = tokens
+    
+    def _remove(self, key: str, field_names: Iterable[str]) -> None:
+        doc = self._doc_tokens.get(key)
+        if not doc:
+            return
+        
+        for field_name in field_names:
+            postings = self._postings[field_name]
+            for token in doc.pop(field_name, ()):
+                keys = postings.get(token)
+                if keys is None:
+                    continue
+                keys.discard(key)
+                if not keys:
+                    del postings[token]
+                    sorted_tokens = self._sorted_tokens[field_name]
+                    del sorted_tokens[bisect.bisect_left(sorted_tokens, token)]
+        
+        if not doc:
+            del self._doc_tokens[key]
+    
+    def sync_files(self, files: List[WorkflowFile]) -> None:
+        """Index new or changed files and drop files that are no longer listed"""
+        current = {}
+        # Keyed by path, since the same file name can appear in several folders
+        for file in files:
+            current[file.path] = file.sha
+            if self._file_shas.get(file.path) != file.sha:
+                self._remove(file.path, self.FILE_FIELDS)
+                self._add(file.path, 'name', [file.name])
+                self._add(file.path, 'path', [file.path])
+        
+        for key in set(self._file_shas) - set(current):
+            self._remove(key, self.FILE_FIELDS)
+        self._file_shas = current
+    
+    def add_analysis(self, key: str, analysis: WorkflowAnalysis) -> None:
+        """Index the searchable fields of a workflow analysis"""
+        self._remove(key, self.ANALYSIS_FIELDS)
+        self._add(key, 'workflow', [analysis.name])
+        self._add(key, 'node_type', analysis.node_types)
+        self._add(key, 'tag', analysis.tags)
+        self._add(key, 'note', analysis.sticky_notes)
+        self._add(key, 'description', [analysis.description or ''])
+    
+    def remove_analysis(self, key: str) -> None:
+        self._remove(key, self.ANALYSIS_FIELDS)
+    
+    def _prefix_matches(self, token: str, field_names: Iterable[str]) -> Set[str]:
+        keys = set()
+        for field_name in field_names:
+            sorted_tokens = self._sorted_tokens[field_name]
+            postings = self._postings[field_name]
+            position = bisect.bisect_left(sorted_tokens, token)
+            while position < len(sorted_tokens) and sorted_tokens[position].startswith(token):
+                keys |= postings[sorted_tokens[position]]
+                position += 1
+        return keys
+    
+    def search(self, query: str, fields: Optional[Iterable[str]] = None) -> Set[str]:
+        """Return keys matching every query token, each token matched as a prefix"""
+        field_names = tuple(fields) if fields else tuple(self._postings)
+        tokens = re.findall(r"[a-z0-9]+", query.lower())
+        if not tokens:
+            return set(self._doc_tokens)
+        
+        result: Optional[Set[str]] = None
+        # Rarer (longer) tokens first keeps intermediate sets small
+        for token in sorted(tokens, key=len, reverse=True):
+            matches = self._prefix_matches(token, field_names)
+            result = matches if result is None else result & matches
+            if not result:
+                return set()
+        return result or set()
+
+class DuplicateIndex:
+    """Class to group structurally identical and near-duplicate workflows with MinHash LSH, updated incrementally
+    
+    Identical structures share one entry, so LSH only compares distinct structures; each band buckets them by
+    its slice of the signature, and only structures sharing a bucket are ever compared.
+    """
+    
+    def __init__(self, bands: int = LSH_BANDS, similarity: float = NEAR_DUPLICATE_SIMILARITY):
+        self.rows_per_band = MINHASH_PERMUTATIONS // bands
+        self.similarity = similarity
+        self._structure_of: Dict[str, str] = {}  # path -> structure hash
+        self._paths: Dict[str, Set[str]] = {}  # structure hash -> paths
+        self._signatures: Dict[str, np.ndarray] = {}  # structure hash -> MinHash signature
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]  # band -> band slice -> structures
+        self._groups: Optional[List[List[List[str]]]] = None  # Cached until the next change
+    
+    def __len__(self) -> int:
+        """Number of distinct structures"""
+        return len(self._paths)
+    
+    def _bands(self, signature: np.ndarray) -> Iterator[Tuple[Dict[bytes, Set[str]], bytes]]:
+        for band, buckets in enumerate(self._buckets):
+            yield buckets, signature[band * self.rows_per_band:(band + 1) * self.rows_per_band].tobytes()
+    
+    def add(self, path: str, structure_hash: Optional[str], signature: Iterable[int]) -> None:
+        self.remove(path)
+        signature = np.fromiter(signature, dtype=np.uint32)
+        if structure_hash is None or signature.size != MINHASH_PERMUTATIONS:
+            return
+        
+        self._structure_of[path] = structure_hash
+        paths = self._paths.setdefault(structure_hash, set())
+        if not paths:
+            self._signatures[structure_hash] = signature
+            for buckets, key in self._bands(signature):
+                buckets.setdefault(key, set()).add(structure_hash)
+        paths.add(path)
+        self._groups = None
+    
+    def remove(self, path: str) -> None:
+        structure_hash = self._structure_of.pop(path, None)
+        if structure_hash is None:
+            return
+        
+        paths = self._paths[structure_hash]
+        paths.discard(path)
+        if not paths:
+            del self._paths[structure_hash]
+            for buckets, key in self._bands(self._signatures.pop(structure_hash)):
+                bucket = buckets[key]
+                bucket.discard(structure_hash)
+                if not bucket:
+                    del buckets[key]
+        self._groups = None
+    
+    def groups(self) -> List[List[List[str]]]:
+        """Return duplicate groups, largest first, each as a list of variants (sorted paths sharing one structure)"""
+        if self._groups is not None:
+            return self._groups
+        
+        parent: Dict[str, str] = {}
+        
+        def find(structure: str) -> str:
+            root = structure
+            while parent.get(root, root) != root:
+                root = parent[root]
+            if root != structure:
+                parent[structure] = root
+            return root
+        
+        # Every pair sharing a bucket is compared, one member against the later ones at a time,
+        # so a large bucket never needs a full pairwise matrix
+        for buckets in self._buckets:
+            for bucket in buckets.values():
+                if len(bucket) < 2:
+                    continue
+                members = sorted(bucket)
+                signatures = np.stack([self._signatures[structure] for structure in members])
+                for i in range(len(members) - 1):
+                    similar = (signatures[i + 1:] == signatures[i]).mean(axis=1) >= self.similarity
+                    for offset in np.flatnonzero(similar):
+                        root, other = find(members[i]), find(members[i + 1 + offset])
+                        if root != other:
+                            parent[other] = root
+        
+        clusters: Dict[str, List[List[str]]] = {}
+        for structure, paths in self._paths.items():
+            clusters.setdefault(find(structure), []).append(sorted(paths))
+        groups = [sorted(variants, key=len, reverse=True) for variants in clusters.values()
+                  if sum(len(variant) for variant in variants) > 1]
+        self._groups = sorted(groups, key=lambda variants: (-sum(len(variant) for variant in variants), variants[0][0]))
+        return self._groups
+
+class CorpusStats:
+    """Class to keep per-workflow report columns in NumPy arrays plus running aggregates, updated as analyses load and unload"""
+    
+    PERCENTILES = (10, 25, 50, 75, 90, 99)
+    HISTOGRAM_BINS = 20
+    
+    def __init__(self, capacity: int = 256):
+        self._rows: Dict[str, int] = {}  # path -> row
+        self._free_rows: List[int] = []
+        self._row_limit = 0  # Rows past this have never been used
+        self._folder_ids: Dict[str, int] = {}
+        self._folders: List[str] = []
+        self.node_counts = np.zeros(capacity, dtype=np.int32)
+        self.connection_counts = np.zeros(capacity, dtype=np.int32)
+        self.has_trigger = np.zeros(capacity, dtype=bool)
+        self.folder = np.zeros(capacity, dtype=np.int32)
+        self.active = np.zeros(capacity, dtype=bool)
+        # Row x node type id presence matrix, columns grow with the shared vocabulary
+        self.node_type_presence = np.zeros((capacity, 64), dtype=np.uint8)
+        
+        # Running aggregates, adjusted by each add/remove so the report never rescans the rows
+        self.total_nodes = 0
+        self.total_connections = 0
+        self.with_triggers = 0
+        self.node_type_usage = np.zeros(64, dtype=np.int64)
+        self._node_count_frequency: Dict[int, int] = {}  # node count -> workflows, for min/max and percentiles
+        self._folder_totals: List[List[int]] = []  # folder id -> [workflows, nodes, triggers]
+        self.duplicates = DuplicateIndex()
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    @staticmethod
+    def folder_of(path: str) -> str:
+        folder = str(Path(path).parent)
+        return 'Root' if folder == '.' else folder
+    
+    def _grow(self, rows: int, node_types: int) -> None:
+        """Double the row and node type capacity as needed, so additions stay amortized O(1)"""
+        capacity, type_capacity = self.node_type_presence.shape
+        new_capacity = max(rows, capacity * 2) if rows > capacity else capacity
+        new_type_capacity = max(node_types, type_capacity * 2) if node_types > type_capacity else type_capacity
+        if new_capacity == capacity and new_type_capacity == type_capacity:
+            return
+        
+        for column in ('node_counts', 'connection_counts', 'has_trigger', 'folder', 'active'):
+            old = getattr(self, column)
+            grown = np.zeros(new_capacity, dtype=old.dtype)
+            grown[:capacity] = old
+            setattr(self, column, grown)
+        presence = np.zeros((new_capacity, new_type_capacity), dtype=np.uint8)
+        presence[:capacity, :type_capacity] = self.node_type_presence
+        self.node_type_presence = presence
+        usage = np.zeros(new_type_capacity, dtype=np.int64)
+        usage[:type_capacity] = self.node_type_usage
+        self.node_type_usage = usage
+    
+    def _account(self, row: int, sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) one row's contribution to the running aggregates"""
+        node_count = int(self.node_counts[row])
+        has_trigger = int(self.has_trigger[row])
+        self.total_nodes += sign * node_count
+        self.total_connections += sign * int(self.connection_counts[row])
+        self.with_triggers += sign * has_trigger
+        self.node_type_usage[np.flatnonzero(self.node_type_presence[row])] += sign
+        
+        frequency = self._node_count_frequency.get(node_count, 0) + sign
+        if frequency:
+            self._node_count_frequency[node_count] = frequency
+        else:
+            del self._node_count_frequency[node_count]
+        
+        folder_totals = self._folder_totals[self.folder[row]]
+        folder_totals[0] += sign
+        folder_totals[1] += sign * node_count
+        folder_totals[2] += sign * has_trigger
+    
+    def _add_row(self, path: str, node_count: int, connection_count: int, has_trigger: bool,
+                 node_type_ids: Iterable[int]) -> None:
+        node_type_ids = np.fromiter(node_type_ids, dtype=np.int64)
+        row = self._rows.get(path)
+        if row is None:
+            row = self._free_rows.pop() if self._free_rows else len(self._rows)
+            self._rows[path] = row
+            self._row_limit = max(self._row_limit, row + 1)
+        else:
+            self._account(row, -1)
+        self._grow(row + 1, int(node_type_ids.max()) + 1 if node_type_ids.size else 0)
+        
+        folder = self.folder_of(path)
+        folder_id = self._folder_ids.get(folder)
+        if folder_id is None:
+            folder_id = self._folder_ids[folder] = len(self._folders)
+            self._folders.append(folder)
+            self._folder_totals.append([0, 0, 0])
+        
+        self.node_counts[row] = node_count
+        self.connection_counts[row] = connection_count
+        self.has_trigger[row] = has_trigger
+        self.folder[row] = folder_id
+        self.active[row] = True
+        self.node_type_presence[row] = 0
+        self.node_type_presence[row, node_type_ids] = 1
+        self._account(row, 1)
+    
+    def add(self, path: str, analysis: WorkflowAnalysis) -> None:
+        self._add_row(path, analysis.node_count, analysis.connection_count, analysis.has_trigger,
+                      analysis.node_type_ids)
+        self.duplicates.add(path, analysis.structure_hash, analysis.minhash)
+    
+    def add_rows(self, rows: Iterable[Tuple[str, int, int, bool, List[str], Optional[str], bytes]]) -> None:
+        """Add (path, node count, connection count, has trigger, node type names, structure hash, MinHash bytes)
+        rows, e.g. from the catalog"""
+        vocabulary = get_node_type_vocabulary()
+        for path, node_count, connection_count, has_trigger, node_types, structure_hash, minhash in rows:
+            self._add_row(path, node_count, connection_count, bool(has_trigger),
+                          (vocabulary.id_for(node_type) for node_type in node_types))
+            self.duplicates.add(path, structure_hash, np.frombuffer(minhash or b"", dtype=np.uint32))
+    
+    def remove(self, path: str) -> None:
+        self.duplicates.remove(path)
+        row = self._rows.pop(path, None)
+        if row is None:
+            return
+        self._account(row, -1)
+        self.active[row] = False
+        self.node_type_presence[row] = 0
+        self._free_rows.append(row)
+    
+    def summary(self, top_n: int = 10) -> Dict[str, Any]:
+        """Build report statistics from the running aggregates, without a pass over the workflows"""
+        total = len(self._rows)
+        stats: Dict[str, Any] = {'total': total}
+        if not total:
+            return stats
+        
+        # Node count distribution from the (small) table of distinct node counts
+        distinct_counts = np.fromiter(self._node_count_frequency.keys(), dtype=np.int64)
+        order = np.argsort(distinct_counts)
+        distinct_counts = distinct_counts[order]
+        frequencies = np.fromiter(self._node_count_frequency.values(), dtype=np.int64)[order]
+        # "higher" percentiles land on actual node counts (the median is the upper middle value)
+        ranks = np.ceil((total - 1) * np.array(self.PERCENTILES) / 100).astype(np.int64)
+        positions = np.searchsorted(np.cumsum(frequencies), ranks, side='right')
+        
+        stats.update({
+            'total_nodes': self.total_nodes,
+            'total_connections': self.total_connections,
+            'with_triggers': self.with_triggers,
+            'min_nodes': int(distinct_counts[0]),
+            'max_nodes': int(distinct_counts[-1]),
+            'percentiles': dict(zip(self.PERCENTILES, distinct_counts[positions].tolist()))
+        })
+        stats['median_nodes'] = stats['percentiles'][50]
+        
+        bins = min(self.HISTOGRAM_BINS, stats['max_nodes'] - stats['min_nodes'] + 1)
+        counts, edges = np.histogram(distinct_counts, bins=bins, weights=frequencies)
+        stats['histogram'] = (counts.astype(int).tolist(), edges.tolist())
+        
+        # Workflows per node type, and how often the most popular types appear together
+        vocabulary = get_node_type_vocabulary()
+        usage = self.node_type_usage
+        top_ids = [int(i) for i in np.argsort(-usage, kind='stable')[:top_n] if usage[i]]
+        stats['top_node_types'] = [(vocabulary.name(i), int(usage[i])) for i in top_ids]
+        # Spare capacity is left out of the product; removed rows are all zeros and add nothing
+        top_presence = self.node_type_presence[:self._row_limit, top_ids].astype(np.int32)
+        stats['co_occurrence'] = ([vocabulary.name(i) for i in top_ids], (top_presence.T @ top_presence).tolist())
+        
+        # Per-folder breakdown
+        stats['folders'] = sorted(((self._folders[i], workflows, nodes, triggers)
+                                   for i, (workflows, nodes, triggers) in enumerate(self._folder_totals) if workflows),
+                                  key=lambda folder: folder[1], reverse=True)
+        
+        # Copies beyond the first of each duplicate group are redundant
+        groups = self.duplicates.groups()
+        stats['duplicate_groups'] = groups
+        stats['redundant_workflows'] = sum(sum(len(variant) for variant in variants) - 1 for variants in groups)
+        stats['distinct_structures'] = len(self.duplicates)
+        return stats
+
+class SharedWorkflowStore:
+    """Class to hold parsed workflows and their analyses once per process, keyed by blob SHA and shared by every session"""
+    
+    def __init__(self, max_bytes: int = STORE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # sha -> (analysis, workflow, estimated in-memory size), least recently used first
+        self._entries: "OrderedDict[str, Tuple[WorkflowAnalysis, WorkflowPayload, int]]" = OrderedDict()
+        self._total_bytes = 0
+    
+    @staticmethod
+    def estimate_size(obj: Any) -> int:
+        """Estimate the memory held by a parsed document, counting shared objects once"""
+        seen: Set[int] = set()
+        pending = [obj]
+        total = 0
+        while pending:
+            item = pending.pop()
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            total += sys.getsizeof(item)
+            if isinstance(item, dict):
+                pending.extend(item.keys())
+                pending.extend(item.values())
+            elif isinstance(item, (list, tuple, set, frozenset)):
+                pending.extend(item)
+        return total
+    
+    def put(self, sha: str, workflow_data: WorkflowPayload, analysis: WorkflowAnalysis) -> WorkflowAnalysis:
+        """Store a workflow, returning the canonical analysis object sessions should reference"""
+        with self._lock:
+            entry = self._entries.get(sha)
+            if entry is not None:
+                self._entries.move_to_end(sha)
+                return entry[0]
+        
+        # Measured outside the lock; a parsed document is several times the size of its file
+        analysis_fields = [getattr(analysis, name) for name in analysis.__slots__]
+        size = self.estimate_size((workflow_data, analysis, analysis_fields))
+        with self._lock:
+            entry = self._entries.get(sha)
+            if entry is not None:
+                return entry[0]
+            self._entries[sha] = (analysis, workflow_data, size)
+            self._total_bytes += size
+            self._evict()
+        return analysis
+    
+    def get_analysis(self, sha: str) -> Optional[WorkflowAnalysis]:
+        """Return a stored analysis, or None if it was never loaded or has been evicted"""
+        with self._lock:
+            entry = self._entries.get(sha)
+            if entry is None:
+                return None
+            self._entries.move_to_end(sha)
+            return entry[0]
+    
+    def get_data(self, sha: str) -> Optional[WorkflowPayload]:
+        """Return a stored workflow, or None if it was never loaded or has been evicted"""
+        with self._lock:
+            entry = self._entries.get(sha)
+            if entry is None:
+                return None
+            self._entries.move_to_end(sha)
+            return entry[1]
+    
+    def _evict(self) -> None:
+        """Drop least recently used workflows and their analyses until the store fits its budget (lock held)"""
+        # Evicted analyses are still in the disk cache and the catalog
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+
+@st.cache_resource
+def get_workflow_store() -> SharedWorkflowStore:
+    """Return the process-wide shared workflow store"""
+    return SharedWorkflowStore()
+
+class WorkflowCatalog:
+    """Class to keep a persistent SQLite catalog of workflow files and analyses shared by all sessions"""
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            source TEXT NOT NULL,
+            path TEXT NOT NULL,
+            name TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            download_url TEXT NOT NULL,
+            sha TEXT NOT NULL,
+            PRIMARY KEY (source, path)
+        );
+        CREATE INDEX IF NOT EXISTS files_sha ON files (sha);
+        CREATE TABLE IF NOT EXISTS analyses (
+            sha TEXT PRIMARY KEY,
+            name TEXT,
+            node_count INTEGER NOT NULL,
+            connection_count INTEGER NOT NULL,
+            has_trigger INTEGER NOT NULL,
+            created_at TEXT,
+            updated_at TEXT,
+            tags TEXT,
+            description TEXT,
+            sticky_notes TEXT,
+            structure_hash TEXT
+        );
+        CREATE INDEX IF NOT EXISTS analyses_node_count ON analyses (node_count);
+        CREATE INDEX IF NOT EXISTS analyses_structure ON analyses (structure_hash);
+        CREATE TABLE IF NOT EXISTS structures (
+            structure_hash TEXT PRIMARY KEY,
+            minhash BLOB NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS node_types (
+            sha TEXT NOT NULL,
+            node_type TEXT NOT NULL,
+            PRIMARY KEY (sha, node_type)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS node_types_type ON node_types (node_type, sha);
+        CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5 (source UNINDEXED, path UNINDEXED, terms);
+        CREATE VIRTUAL TABLE IF NOT EXISTS workflows_fts USING fts5 (sha UNINDEXED, terms);
+    """
+    
+    def __init__(self, db_path: Path = CATALOG_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._synced_listings: Dict[str, str] = {}  # source -> digest of the last synced listing
+        
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        
+        # The catalog is derived data, so an outdated schema is simply rebuilt
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != CATALOG_SCHEMA_VERSION:
+            with self._conn:
+                for table in ("files", "analyses", "node_types", "structures", "files_fts", "workflows_fts"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.execute(f"PRAGMA user_version = {CATALOG_SCHEMA_VERSION}")
+        self._conn.executescript(self.SCHEMA)
+    
+    @property
+    def data_version(self) -> int:
+        """Changes whenever another connection, such as the indexer, commits; this process's writes leave it alone"""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    @staticmethod
+    def _terms(texts: Iterable[str]) -> str:
+        """Pre-tokenize text so FTS5 also indexes camelCase parts"""
+        tokens = set()
+        for text in texts:
+            tokens |= SearchIndex.tokenize(text)
+        return ' '.join(sorted(tokens))
+    
+    def sync_files(self, source: str, files: List[WorkflowFile]) -> None:
+        """Replace the catalog listing of a source when it has changed"""
+        digest = hashlib.sha1('\n'.join(f"{f.path}\0{f.sha}" for f in files).encode("utf-8")).hexdigest()
+        # Checked under the lock, so concurrent sessions syncing one listing write it once
+        with self._lock, self._conn:
+            if self._synced_listings.get(source) == digest:
+                return
+            self._conn.execute("DELETE FROM files WHERE source = ?", (source,))
+            self._conn.execute("DELETE FROM files_fts WHERE source = ?", (source,))
+            self._conn.executemany(
+                "INSERT INTO files (source, path, name, size, download_url, sha) VALUES (?, ?, ?, ?, ?, ?)",
+                [(source, f.path, f.name, f.size, f.download_url, f.sha) for f in files]
+            )
+            self._conn.executemany(
+                "INSERT INTO files_fts (source, path, terms) VALUES (?, ?, ?)",
+                [(source, f.path, self._terms([f.name, f.path])) for f in files]
+            )
+            self._synced_listings[source] = digest
+    
+    def add_analysis(self, sha: str, analysis: WorkflowAnalysis) -> None:
+        """Insert or replace the analysis stored for a blob SHA"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (sha, analysis.name, analysis.node_count, analysis.connection_count, int(analysis.has_trigger),
+                 analysis.created_at, analysis.updated_at, json.dumps(list(analysis.tags)), analysis.description,
+                 json.dumps(analysis.sticky_notes), analysis.structure_hash)
+            )
+            # Copies of a template share one signature row
+            if analysis.structure_hash:
+                self._conn.execute("INSERT OR IGNORE INTO structures (structure_hash, minhash) VALUES (?, ?)",
+                                   (analysis.structure_hash, analysis.minhash.tobytes()))
+            self._conn.execute("DELETE FROM node_types WHERE sha = ?", (sha,))
+            self._conn.executemany("INSERT OR IGNORE INTO node_types (sha, node_type) VALUES (?, ?)",
+                                   [(sha, node_type) for node_type in analysis.node_types])
+            self._conn.execute("DELETE FROM workflows_fts WHERE sha = ?", (sha,))
+            self._conn.execute(
+                "INSERT INTO workflows_fts (sha, terms) VALUES (?, ?)",
+                (sha, self._terms([analysis.name, analysis.description or ''] + list(analysis.node_types)
+                                  + list(analysis.tags) + list(analysis.sticky_notes)))
+            )
+    
+    @staticmethod
+    def _like_pattern(text: str) -> str:
+        escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f"%{escaped}%"
+    
+    def filter_paths(self, source: str, filters: Dict[str, Any]) -> Set[str]:
+        """Return the paths of a source's files that pass the search, folder and analysis filters"""
+        clauses = ["f.source = ?"]
+        params: List[Any] = [source]
+        
+        # Every search word must prefix-match a file term or a workflow term
+        for token in re.findall(r"[a-z0-9]+", filters['search_term'].lower()):
+            clauses.append(
+                "(f.path IN (SELECT path FROM files_fts WHERE files_fts MATCH ? AND source = ?)"
+                " OR f.sha IN (SELECT sha FROM workflows_fts WHERE workflows_fts MATCH ?))"
+            )
+            params.extend([f'"{token}"*', source, f'"{token}"*'])
+        
+        if filters['folder_filter']:
+            clauses.append("instr(lower(f.path), ?) > 0")
+            params.append(filters['folder_filter'])
+        
+        # Analysis filters only apply to workflows that have been analyzed
+        if filters['min_nodes'] > 0 or filters['max_nodes'] < 500:
+            clauses.append("(a.sha IS NULL OR a.node_count BETWEEN ? AND ?)")
+            params.extend([filters['min_nodes'], filters['max_nodes']])
+        
+        if filters['node_type_filter']:
+            clauses.append(
+                "(a.sha IS NULL OR f.sha IN (SELECT sha FROM node_types WHERE lower(node_type) LIKE ? ESCAPE '\\'))"
+            )
+            params.append(self._like_pattern(filters['node_type_filter']))
+        
+        query = f"SELECT f.path FROM files f LEFT JOIN analyses a ON a.sha = f.sha WHERE {' AND '.join(clauses)}"
+        with self._lock:
+            return {row[0] for row in self._conn.execute(query, params)}
     
+    def unanalyzed_paths(self, source: str) -> Set[str]:
+        """Return the paths of a source's files that have no analysis yet"""
+        with self._lock:
+            return {row[0] for row in self._conn.execute(
+                "SELECT f.path FROM files f LEFT JOIN analyses a ON a.sha = f.sha WHERE f.source = ? AND a.sha IS NULL",
+                (source,)
+            )}
+    
+    def corpus_rows(self, source: str, paths: Optional[Iterable[str]] = None
+                    ) -> List[Tuple[str, int, int, bool, List[str], Optional[str], bytes]]:
+        """Return (path, node count, connection count, has trigger, node types, structure hash, MinHash bytes)
+        for every analyzed file of a source, or only for the given paths"""
+        if paths is None:
+            return self._corpus_rows("f.source = ?", [source])
+        paths = list(paths)
+        rows = []
+        for start in range(0, len(paths), CATALOG_QUERY_BATCH):
+            batch = paths[start:start + CATALOG_QUERY_BATCH]
+            rows.extend(self._corpus_rows(f"f.source = ? AND f.path IN ({', '.join('?' * len(batch))})",
+                                          [source] + batch))
+        return rows
+    
+    def _corpus_rows(self, where: str, params: List[Any]
+                     ) -> List[Tuple[str, int, int, bool, List[str], Optional[str], bytes]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT f.path, a.node_count, a.connection_count, a.has_trigger, f.sha, a.structure_hash, s.minhash"
+                " FROM files f JOIN analyses a ON a.sha = f.sha"
+                f" LEFT JOIN structures s ON s.structure_hash = a.structure_hash WHERE {where}",
+                params
+            ).fetchall()
+            node_types: Dict[str, List[str]] = {}
+            for sha, node_type in self._conn.execute(
+                f"SELECT DISTINCT nt.sha, nt.node_type FROM files f JOIN node_types nt ON nt.sha = f.sha WHERE {where}",
+                params
+            ):
+                node_types.setdefault(sha, []).append(node_type)
+        
+        return [(path, node_count, connection_count, bool(has_trigger), node_types.get(sha, []), structure_hash, minhash)
+                for path, node_count, connection_count, has_trigger, sha, structure_hash, minhash in rows]
+
+@st.cache_resource
+def get_workflow_catalog() -> Optional[WorkflowCatalog]:
+    """Return the process-wide workflow catalog, or None if SQLite lacks FTS5 or the file is unusable"""
+    try:
+        return WorkflowCatalog()
+    except sqlite3.Error:
+        return None
+
 @dataclass
-class WorkflowAnalysis:
-    """Data class to represent workflow analysis"""
-    name: str
-    node_count: int
-    connection_count: int
-    has_trigger: bool
-    node_types: List[str]
-    created_at: Optional[str]
-    updated_at: Optional[str]
-    tags: List[str]
-    description: Optional[str]
+class SourceCorpus:
+    """Data class to hold one source's live report columns and the listing they were built for"""
+    stats: CorpusStats
+    data_version: Optional[int]  # Catalog data_version at the last full build, None without a catalog
+    listing: Dict[str, str]  # path -> blob SHA
+    paths: Dict[str, Set[str]]  # blob SHA -> paths
 
-class GitHubRepository:
-    """Class to handle GitHub repository operations"""
+class CorpusStatsCache:
+    """Class to keep one live set of report columns per source, shared by every session
     
-    def __init__(self, owner: str, repo: str, branch: str = "main"):
-        self.owner = owner
-        self.repo = repo
-        self.branch = branch
-        self.api_base_url = f"https://api.github.com/repos/{owner}/{repo}"
-        self.raw_base_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}"
+    Analyses written by this process are applied as deltas; a full rebuild only happens when the
+    catalog's data_version shows another process, such as the indexer, wrote to it.
+    """
     
-    @st.cache_data(ttl=300)
-    def get_all_json_files(_self, path: str = "") -> List[WorkflowFile]:
-        """Recursively fetch all .json files from the repository"""
-        json_files = []
+    def __init__(self, max_sources: int = CORPUS_STATS_SOURCES):
+        self.max_sources = max_sources
+        self._lock = threading.Lock()
+        self._sources: "OrderedDict[str, SourceCorpus]" = OrderedDict()  # least recently used first
+    
+    def record(self, sha: str, analysis: WorkflowAnalysis) -> None:
+        """Apply a newly written analysis to every listed path with that blob SHA"""
+        with self._lock:
+            for corpus in self._sources.values():
+                for path in corpus.paths.get(sha, ()):
+                    corpus.stats.add(path, analysis)
+    
+    def summary(self, source: str, files: List[WorkflowFile], catalog: Optional[WorkflowCatalog],
+                analysis_for: Callable[[WorkflowFile], Optional[WorkflowAnalysis]]) -> Dict[str, Any]:
+        """Return report statistics for every analyzed file in the source's listing
         
-        try:
-            url = f"{_self.api_base_url}/contents/{path}"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                items = response.json()
-                
-                for item in items:
-                    if item['type'] == 'file' and item['name'].endswith('.json'):
-                        json_files.append(WorkflowFile(
-                            name=item['name'],
-                            path=item['path'],
-                            size=item['size'],
-                            download_url=item['download_url'],
-                            sha=item['sha']
-                        ))
-                    elif item['type'] == 'dir':
-                        # Recursively get files from subdirectories
-                        subdirectory_files = _self.get_all_json_files(item['path'])
-                        json_files.extend(subdirectory_files)
-            
-            return sorted(json_files, key=lambda x: x.name.lower())
-            
-        except Exception as e:
-            st.error(f"Error fetching files from GitHub: {str(e)}")
-            return []
+        analysis_for looks up analyses held in memory; the catalog, when there is one, is the source of truth.
+        """
+        # Read before building, so a write landing during the build triggers another rebuild
+        data_version = catalog.data_version if catalog else None
+        # Summaries are computed under the lock too, since deltas from other threads mutate the columns
+        with self._lock:
+            corpus = self._sources.get(source)
+            if corpus is None or corpus.data_version != data_version:
+                corpus = self._build(source, files, catalog, analysis_for, data_version)
+                self._sources[source] = corpus
+            elif len(files) != len(corpus.listing) or any(corpus.listing.get(f.path) != f.sha for f in files):
+                self._apply_listing(corpus, source, files, catalog, analysis_for)
+            self._sources.move_to_end(source)
+            while len(self._sources) > self.max_sources:
+                self._sources.popitem(last=False)
+            return corpus.stats.summary()
     
-    @st.cache_data(ttl=600)
-    def fetch_workflow_content(_self, file: WorkflowFile) -> Optional[Dict[str, Any]]:
-        """Fetch workflow content from a file"""
-        try:
-            response = requests.get(file.download_url, timeout=15)
-            if response.status_code == 200:
-                return response.json()
-            return None
-        except Exception as e:
-            st.error(f"Error fetching {file.name}: {str(e)}")
+    @staticmethod
+    def _build(source: str, files: List[WorkflowFile], catalog: Optional[WorkflowCatalog],
+               analysis_for: Callable[[WorkflowFile], Optional[WorkflowAnalysis]],
+               data_version: Optional[int]) -> SourceCorpus:
+        corpus = SourceCorpus(CorpusStats(), data_version, {}, {})
+        for file in files:
+            corpus.listing[file.path] = file.sha
+            corpus.paths.setdefault(file.sha, set()).add(file.path)
+        if catalog:
+            corpus.stats.add_rows(catalog.corpus_rows(source))
+        else:
+            for file in files:
+                analysis = analysis_for(file)
+                if analysis is not None:
+                    corpus.stats.add(file.path, analysis)
+        return corpus
+    
+    @staticmethod
+    def _apply_listing(corpus: SourceCorpus, source: str, files: List[WorkflowFile],
+                       catalog: Optional[WorkflowCatalog],
+                       analysis_for: Callable[[WorkflowFile], Optional[WorkflowAnalysis]]) -> None:
+        """Drop paths the new listing no longer has or whose blob changed, and add the new ones"""
+        listing = {file.path: file.sha for file in files}
+        for path, sha in corpus.listing.items():
+            if listing.get(path) != sha:
+                corpus.stats.remove(path)
+                corpus.paths[sha].discard(path)
+                if not corpus.paths[sha]:
+                    del corpus.paths[sha]
+        
+        added = [file for file in files if corpus.listing.get(file.path) != file.sha]
+        corpus.listing = listing
+        for file in added:
+            corpus.paths.setdefault(file.sha, set()).add(file.path)
+        if catalog:
+            corpus.stats.add_rows(catalog.corpus_rows(source, [file.path for file in added]))
+        else:
+            for file in added:
+                analysis = analysis_for(file)
+                if analysis is not None:
+                    corpus.stats.add(file.path, analysis)
+
+@st.cache_resource
+def get_corpus_stats_cache() -> CorpusStatsCache:
+    """Return the process-wide report column cache"""
+    return CorpusStatsCache()
+
+def resolve_workflow_analysis(file: WorkflowFile, repo: WorkflowSource, cache: WorkflowCache,
+                              catalog: Optional[WorkflowCatalog],
+                              pool: Optional[concurrent.futures.ProcessPoolExecutor] = None,
+                              store: Optional[SharedWorkflowStore] = None, metrics: Optional[Metrics] = None,
+                              corpus_stats: Optional[CorpusStatsCache] = None,
+                              cancelled: Optional[threading.Event] = None) -> Optional[WorkflowAnalysis]:
+    """Return a workflow's analysis from the shared store, the disk cache or the source
+    
+    New results are written to every cache passed in. Nothing here touches session state, so the
+    UI can call this from background threads and the indexer can call it without a session.
+    """
+    analysis = store.get_analysis(file.sha) if store else None
+    if metrics:
+        metrics.inc("cache_lookups", cache="store", result="miss" if analysis is None else "hit")
+    if analysis is not None:
+        return analysis
+    
+    cached = cache.get(file.sha)
+    if metrics:
+        metrics.inc("cache_lookups", cache="disk", result="hit" if cached else "miss")
+    if cached:
+        data, analysis = cached
+        if analysis is None:
+            analysis = WorkflowAnalyzer.analyze_workflow(data)
+            cache.put(file.sha, data, analysis)
+    else:
+        if cancelled is not None and cancelled.is_set():
             return None
+        if file.size > LARGE_WORKFLOW_BYTES:
+            data = repo.fetch_workflow_content(file)
+            if not data:
+                return None
+            analysis = WorkflowAnalyzer.analyze_workflow(data)
+        else:
+            data = repo.fetch_workflow_bytes(file)
+            if not data:
+                return None
+            if pool is None:
+                fields = analyze_workflow_content(data)
+            else:
+                try:
+                    fields = pool.submit(analyze_workflow_content, data).result()
+                except concurrent.futures.BrokenExecutor:
+                    discard_analysis_pool(pool)
+                    raise
+            analysis = WorkflowAnalysis.create(**fields)
+        cache.put(file.sha, data, analysis)
+    
+    if catalog:
+        catalog.add_analysis(file.sha, analysis)
+        # Notes are often most of a record; the catalog searches them, so the copies in memory drop them
+        analysis = analysis.without_notes()
+    if store:
+        analysis = store.put(file.sha, data, analysis)
+    if corpus_stats:
+        corpus_stats.record(file.sha, analysis)
+    return analysis
 
-class WorkflowAnalyzer:
-    """Class to analyze n8n workflow data"""
+class AnalysisResolver:
+    """Class to resolve missing analyses on a shared thread pool, running at most one resolution per blob"""
     
-    @staticmethod
-    def analyze_workflow(workflow_data: Dict[str, Any]) -> WorkflowAnalysis:
-        """Analyze workflow data and extract insights"""
-        nodes = workflow_data.get('nodes', [])
-        connections = workflow_data.get('connections', {})
-        
-        # Basic counts
-        node_count = len(nodes)
-        connection_count = sum(len(conn) for conn in connections.values())
-        
-        # Node type analysis
-        node_types = []
-        has_trigger = False
-        
-        for node in nodes:
-            node_type = node.get('type', 'unknown')
-            if node_type not in node_types:
-                node_types.append(node_type)
-            
-            # Check for triggers
-            if any(trigger_word in node_type.lower() 
-                  for trigger_word in ['trigger', 'webhook', 'cron', 'interval']):
-                has_trigger = True
-        
-        # Extract metadata
-        name = workflow_data.get('name', 'Unnamed Workflow')
-        created_at = workflow_data.get('createdAt')
-        updated_at = workflow_data.get('updatedAt')
-        tags = workflow_data.get('tags', [])
-        description = workflow_data.get('notes') or workflow_data.get('description')
-        
-        return WorkflowAnalysis(
-            name=name,
-            node_count=node_count,
-            connection_count=connection_count,
-            has_trigger=has_trigger,
-            node_types=node_types,
-            created_at=created_at,
-            updated_at=updated_at,
-            tags=tags,
-            description=description
-        )
+    def __init__(self, workers: int = RESOLVE_WORKERS):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resolve")
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+    
+    def submit(self, sha: str, resolve: Callable[[], Optional[WorkflowAnalysis]]) -> concurrent.futures.Future:
+        """Start resolving a blob's analysis, or join the resolution already running for it"""
+        with self._lock:
+            future = self._in_flight.get(sha)
+            if future is None:
+                future = self._executor.submit(resolve)
+                self._in_flight[sha] = future
+                future.add_done_callback(lambda _: self._finished(sha))
+            return future
+    
+    def _finished(self, sha: str) -> None:
+        with self._lock:
+            self._in_flight.pop(sha, None)
+
+@st.cache_resource
+def get_analysis_resolver() -> AnalysisResolver:
+    """Return the process-wide analysis resolver"""
+    return AnalysisResolver()
+
+class PrefetchBatch:
+    """Class to track one set of queued prefetch tasks so they can be cancelled together"""
+    
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.futures: List[concurrent.futures.Future] = []
+    
+    def cancel(self) -> None:
+        self.cancelled.set()
+        for future in self.futures:
+            future.cancel()
+
+class PagePrefetcher:
+    """Class to warm the shared caches for upcoming result pages on background threads"""
+    
+    def __init__(self, workers: int = PREFETCH_WORKERS):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+    
+    def submit(self, files: List[WorkflowFile],
+               warm: Callable[[WorkflowFile, threading.Event], None]) -> PrefetchBatch:
+        """Queue files for warming, in order; tasks still queued when the batch is cancelled never run"""
+        batch = PrefetchBatch()
+        batch.futures = [self._executor.submit(warm, file, batch.cancelled) for file in files]
+        return batch
+
+@st.cache_resource
+def get_page_prefetcher() -> PagePrefetcher:
+    """Return the process-wide page prefetcher"""
+    return PagePrefetcher()
 
 class UIComponents:
     """Class containing reusable UI components"""
@@ -195,7 +2230,7 @@ class UIComponents:
     
     @staticmethod
     def render_workflow_card(file: WorkflowFile, analysis: Optional[WorkflowAnalysis], 
-                           repo: GitHubRepository) -> None:
+                           repo: WorkflowSource) -> None:
         """Render a workflow card with analysis and download options"""
         with st.container():
             st.markdown('<div class="workflow-card">', unsafe_allow_html=True)
@@ -236,6 +2271,21 @@ class UIComponents:
                     st.metric("Node Types", len(analysis.node_types))
                     st.markdown('</div>', unsafe_allow_html=True)
                 
+                # Structure row
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Max Depth", analysis.max_depth)
+                with col2:
+                    st.metric("Cycles", analysis.cycle_count)
+                with col3:
+                    st.metric("Max Fan-out", analysis.max_fan_out)
+                with col4:
+                    st.metric("Unreachable", analysis.unreachable_count,
+                              help=f"{analysis.orphan_count} node(s) have no connections at all")
+                
+                if analysis.fan_out_hotspots:
+                    st.write(f"**Fan-out Hotspots:** {', '.join(analysis.fan_out_hotspots)}")
+                
                 # Additional info
                 if analysis.name and analysis.name != 'Unnamed Workflow':
                     st.write(f"**Workflow Name:** {analysis.name}")
@@ -261,22 +2311,44 @@ class UIComponents:
         # Repository settings
         st.subheader("📁 Repository Settings")
         
-        col1, col2 = st.columns(2)
-        with col1:
-            owner = st.text_input("Repository Owner", value="entremotivator", help="GitHub username or organization")
-        with col2:
-            repo = st.text_input("Repository Name", value="Toolkitflow", help="Repository name")
+        source_type = st.radio("Source", SOURCE_TYPES, horizontal=True)
+        owner, repo, branch, token, local_path = "", "", "", "", ""
         
-        branch = st.text_input("Branch", value="main", help="Git branch to fetch from")
+        if source_type == "Local directory":
+            local_path = st.text_input("Directory", value=DEFAULT_LOCAL_PATH,
+                                       help=f"Local folder or git checkout under {DEFAULT_LOCAL_PATH}")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                owner = st.text_input("Repository Owner", value="entremotivator", help="GitHub username or organization")
+            with col2:
+                repo = st.text_input("Repository Name", value="Toolkitflow", help="Repository name")
+            
+            branch = st.text_input("Branch", value="main", help="Git branch to fetch from")
+            token = st.text_input("GitHub Token (optional)", type="password",
+                                  help="Raises the API rate limit; defaults to the GITHUB_TOKEN environment variable")
         
         # Display options
         st.subheader("📊 Display Options")
         show_analysis = st.checkbox("Show workflow analysis", value=True)
+        show_diagnostics = st.checkbox("Show diagnostics", value=False,
+                                       help="Request counts, cache hit ratios and stage timings for this server process")
         items_per_page = st.slider("Items per page", 5, 50, 15)
         
+        # Loading options
+        st.subheader("⚡ Loading")
+        fetch_engine = st.selectbox("Fetch engine", FETCH_ENGINES,
+                                    help="Engine used by \"Scan & Load All\" for GitHub sources; Asyncio requires the aiohttp package")
+        if fetch_engine == "Asyncio" and aiohttp is None:
+            st.caption("aiohttp is not installed; falling back to threads.")
+        concurrency = st.slider("Concurrent downloads", 1, MAX_CONCURRENCY, BATCH_WORKERS)
+        prefetch_pages = st.slider("Prefetch pages ahead", 0, 5, PREFETCH_PAGES,
+                                   help="Fetch and analyze the next pages in the background so loading them is instant")
+        
         # Filters
         st.subheader("🔍 Filters")
-        search_term = st.text_input("Search workflows", placeholder="Enter filename, workflow name, or node type...")
+        search_term = st.text_input("Search workflows", placeholder="Enter filename, workflow name, or node type...",
+                                    help="Matches words by prefix across file names, paths, workflow names, node types, tags, notes and descriptions")
         
         col1, col2 = st.columns(2)
         with col1:
@@ -290,17 +2362,53 @@ class UIComponents:
         node_type_filter = st.text_input("Node type contains", placeholder="e.g., webhook, http", help="Filter by node types")
         
         return {
+            'source_type': source_type,
+            'local_path': local_path,
             'owner': owner,
             'repo': repo,
             'branch': branch,
+            'token': token,
             'show_analysis': show_analysis,
+            'show_diagnostics': show_diagnostics,
             'items_per_page': items_per_page,
+            'fetch_engine': fetch_engine,
+            'concurrency': concurrency,
+            'prefetch_pages': prefetch_pages,
             'search_term': search_term.lower() if search_term else '',
             'min_nodes': min_nodes,
             'max_nodes': max_nodes,
             'folder_filter': folder_filter.lower() if folder_filter else '',
             'node_type_filter': node_type_filter.lower() if node_type_filter else ''
         }
+    
+    @staticmethod
+    def render_diagnostics(metrics: Metrics):
+        """Render request, cache and stage timing diagnostics"""
+        st.subheader("🩺 Diagnostics")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("HTTP Requests", f"{metrics.counter('http_requests'):,.0f}")
+        with col2:
+            st.metric("Downloaded", f"{metrics.counter('http_bytes') / (1024 * 1024):.1f} MB")
+        
+        ratios = [(cache, metrics.hit_ratio(cache)) for cache in METRICS_CACHES]
+        st.write("**Cache hit ratios:** " + ", ".join(
+            f"{cache} {ratio:.0%}" if ratio is not None else f"{cache} –" for cache, ratio in ratios))
+        
+        stages = metrics.stage_summary()
+        if stages:
+            st.dataframe({
+                'Stage': [stage for stage, *_ in stages],
+                'Runs': [count for _, count, *_ in stages],
+                'p50 (ms)': [round(p50 * 1000, 1) for _, _, _, p50, _, _ in stages],
+                'p99 (ms)': [round(p99 * 1000, 1) for _, _, _, _, p99, _ in stages],
+                'Last (ms)': [round(last * 1000, 1) for *_, last in stages],
+            }, hide_index=True)
+        
+        st.download_button("📈 Export Metrics", data=metrics.prometheus(), file_name="toolkitflow_metrics.prom",
+                           mime="text/plain", help="Prometheus text-format snapshot")
+        if metrics.trace_path:
+            st.caption(f"Stage timings are traced to {metrics.trace_path}")
 
 class WorkflowManager:
     """Main class to manage the workflow application"""
@@ -308,137 +2416,573 @@ class WorkflowManager:
     def __init__(self):
         self.ui = UIComponents()
         self.analyzer = WorkflowAnalyzer()
+        self.cache = get_workflow_cache()
+        self.catalog = get_workflow_catalog()
+        self.store = get_workflow_store()
+        self.corpus_stats = get_corpus_stats_cache()
+        self.metrics = get_metrics()
         
         # Initialize session state
-        if 'workflows_data' not in st.session_state:
-            st.session_state.workflows_data = {}
+        # Sessions only hold blob SHA references; documents live in the shared store
+        if 'loaded_workflows' not in st.session_state:
+            st.session_state.loaded_workflows = {}
         if 'current_page' not in st.session_state:
             st.session_state.current_page = 0
         if 'loaded_analyses' not in st.session_state:
             st.session_state.loaded_analyses = {}
+        if 'removed_workflows' not in st.session_state:
+            st.session_state.removed_workflows = set()  # Paths not to adopt from the shared store again
+        if 'prefetched_workflows' not in st.session_state:
+            st.session_state.prefetched_workflows = set()  # Paths this session prefetched, shown as loaded once warm
+        if 'analysis_requests' not in st.session_state:
+            st.session_state.analysis_requests = {}  # SHA -> running resolution for node filters
+        if 'failed_analyses' not in st.session_state:
+            st.session_state.failed_analyses = {}  # SHA -> rate-limit message, or "" for other failures
+        if 'search_index' not in st.session_state:
+            st.session_state.search_index = SearchIndex()
+        if 'prepared_downloads' not in st.session_state:
+            st.session_state.prepared_downloads = {}
+    
+    @staticmethod
+    def has_analysis_filters(filters: Dict[str, Any]) -> bool:
+        """Whether node count or type filters are set, which need an analysis of every candidate"""
+        return filters['min_nodes'] > 0 or filters['max_nodes'] < 500 or bool(filters['node_type_filter'])
     
-    def filter_workflows(self, files: List[WorkflowFile], filters: Dict[str, Any]) -> List[WorkflowFile]:
-        """Filter workflows based on user criteria"""
+    def filter_workflows(self, files: List[WorkflowFile], filters: Dict[str, Any],
+                         repo: Optional[WorkflowSource] = None
+                         ) -> Tuple[List[WorkflowFile], Dict[str, concurrent.futures.Future]]:
+        """Filter workflows based on user criteria
+        
+        Returns the matches and, by SHA, the analyses node filters are still waiting for. Only workflows
+        with a known analysis pass node filters; unanalyzed ones are resolved in the background, and only
+        as many as the pages up to the current one need. Without a repo to analyze from, they are kept.
+        """
+        analysis_filters = self.has_analysis_filters(filters)
+        if not (filters['search_term'] or filters['folder_filter'] or analysis_filters):
+            return files, {}
+        
+        # Indexed SQL over the shared catalog when available
+        source_key = repo.source_key if repo else None
+        if self.catalog and source_key:
+            matching_paths = self.catalog.filter_paths(source_key, filters)
+            candidates = [f for f in files if f.path in matching_paths]
+            if not analysis_filters:
+                return candidates, {}
+            # Unanalyzed files pass the SQL filter, so the candidates are matches plus possible matches
+            unanalyzed = self.catalog.unanalyzed_paths(source_key)
+            unresolved = {f.sha for f in candidates if f.path in unanalyzed}
+            pending = self._resolve_for_pages(candidates, unresolved, filters, repo)
+            return [f for f in candidates if f.sha not in unresolved], pending
+        
         filtered = files
+        index = st.session_state.search_index
         
         # Search filter
         if filters['search_term']:
-            filtered = [f for f in filtered if (
-                filters['search_term'] in f.name.lower() or
-                filters['search_term'] in f.path.lower() or
-                (f.name in st.session_state.loaded_analyses and 
-                 filters['search_term'] in st.session_state.loaded_analyses[f.name].name.lower())
-            )]
+            matches = index.search(filters['search_term'])
+            filtered = [f for f in filtered if f.path in matches]
         
         # Folder filter
         if filters['folder_filter']:
             filtered = [f for f in filtered if filters['folder_filter'] in f.path.lower()]
         
-        # Node count and type filters (only for loaded workflows)
-        if filters['min_nodes'] > 0 or filters['max_nodes'] < 500 or filters['node_type_filter']:
-            filtered = [f for f in filtered if self._passes_analysis_filters(f, filters)]
+        if not analysis_filters:
+            return filtered, {}
         
-        return filtered
+        # Node count and type filters
+        unresolved = {f.sha for f in filtered if self._analysis_for(f) is None}
+        node_type_mask = (get_node_type_vocabulary().mask_matching(filters['node_type_filter'])
+                          if filters['node_type_filter'] else None)
+        candidates = [f for f in filtered
+                      if f.sha in unresolved or self._passes_analysis_filters(f, filters, node_type_mask)]
+        if repo is None:
+            # Without a source to analyze from, unknown workflows are kept rather than hidden for good
+            return candidates, {}
+        pending = self._resolve_for_pages(candidates, unresolved, filters, repo)
+        return [f for f in candidates if f.sha not in unresolved], pending
     
-    def _passes_analysis_filters(self, file: WorkflowFile, filters: Dict[str, Any]) -> bool:
-        """Check if a workflow passes analysis-based filters"""
-        if file.name not in st.session_state.loaded_analyses:
-            return True  # Don't filter out unloaded workflows
+    def _analysis_for(self, file: WorkflowFile) -> Optional[WorkflowAnalysis]:
+        """Return a workflow's analysis if this session or any other has already produced it"""
+        return st.session_state.loaded_analyses.get(file.path) or self.store.get_analysis(file.sha)
+    
+    def _resolve_for_pages(self, candidates: List[WorkflowFile], unresolved: Set[str], filters: Dict[str, Any],
+                           repo: Optional[WorkflowSource]) -> Dict[str, concurrent.futures.Future]:
+        """Start resolving the unresolved candidates that could land on the pages up to the current one
         
-        analysis = st.session_state.loaded_analyses[file.name]
+        Candidates are matches and possible matches in display order. Returns the resolutions still running;
+        ones that fail are hidden until the next scan instead of being retried on every rerun.
+        """
+        in_flight = st.session_state.analysis_requests
+        failed = st.session_state.failed_analyses
+        for sha, future in list(in_flight.items()):
+            if not future.done():
+                continue
+            del in_flight[sha]
+            try:
+                if future.result() is None:
+                    failed[sha] = ""
+            except RateLimitError as e:
+                failed[sha] = str(e)
+            except Exception:
+                failed[sha] = ""
+        
+        if repo is None or not unresolved:
+            return {}
+        
+        # Every candidate may take a slot, so the first ones are all the shown pages can need
+        needed = (st.session_state.current_page + 1) * filters['items_per_page']
+        wanted = [f for f in candidates if f.sha not in failed][:needed]
+        resolver = get_analysis_resolver()
+        pool = get_analysis_pool()
+        for file in wanted:
+            if file.sha in unresolved and file.sha not in in_flight:
+                in_flight[file.sha] = resolver.submit(
+                    file.sha, lambda file=file: self._resolve_analysis(file, repo, pool))
+        return {file.sha: in_flight[file.sha] for file in wanted if file.sha in in_flight}
+    
+    def _passes_analysis_filters(self, file: WorkflowFile, filters: Dict[str, Any],
+                                 node_type_mask: Optional[int] = None) -> bool:
+        """Check if a workflow passes analysis-based filters"""
+        analysis = self._analysis_for(file)
+        if analysis is None:
+            return True  # Unanalyzed workflows are possible matches; filter_workflows decides what to show
         
         # Node count filter
         if not (filters['min_nodes'] <= analysis.node_count <= filters['max_nodes']):
             return False
         
         # Node type filter
-        if filters['node_type_filter']:
-            node_types_str = ' '.join(analysis.node_types).lower()
-            if filters['node_type_filter'] not in node_types_str:
-                return False
+        if node_type_mask is not None and not analysis.has_any_node_type(node_type_mask):
+            return False
+        
+        return True
+    
+    def _store_workflow(self, file: WorkflowFile, data: WorkflowPayload, analysis: WorkflowAnalysis) -> None:
+        """Record a newly loaded workflow in the shared store and reference it from this session"""
+        if self.catalog:
+            self.catalog.add_analysis(file.sha, analysis)
+            analysis = analysis.without_notes()
+        analysis = self.store.put(file.sha, data, analysis)
+        self.corpus_stats.record(file.sha, analysis)
+        self._reference_workflow(file, analysis)
+    
+    def _reference_workflow(self, file: WorkflowFile, analysis: WorkflowAnalysis) -> None:
+        """Mark a workflow as loaded in session state"""
+        st.session_state.loaded_workflows[file.path] = file.sha
+        st.session_state.loaded_analyses[file.path] = analysis
+        st.session_state.removed_workflows.discard(file.path)
+        if not self.catalog:
+            st.session_state.search_index.add_analysis(file.path, analysis)
+    
+    def _forget_workflow(self, file: WorkflowFile) -> None:
+        """Drop a loaded workflow and its analysis from session state"""
+        st.session_state.loaded_workflows.pop(file.path, None)
+        st.session_state.loaded_analyses.pop(file.path, None)
+        st.session_state.removed_workflows.add(file.path)
+        st.session_state.search_index.remove_analysis(file.path)
+    
+    def _load_from_cache(self, file: WorkflowFile) -> bool:
+        """Load a workflow from the shared store or the persistent cache, re-analyzing stale entries"""
+        analysis = self.store.get_analysis(file.sha)
+        self.metrics.inc("cache_lookups", cache="store", result="miss" if analysis is None else "hit")
+        if analysis is not None:
+            self._reference_workflow(file, analysis)
+            return True
+        
+        cached = self.cache.get(file.sha)
+        self.metrics.inc("cache_lookups", cache="disk", result="hit" if cached else "miss")
+        if not cached:
+            return False
+        
+        data, analysis = cached
+        if analysis is None:
+            analysis = self.analyzer.analyze_workflow(data)
+            self.cache.put(file.sha, data, analysis)
+        
+        self._store_workflow(file, data, analysis)
+        return True
+    
+    def _cached_workflow_text(self, file: WorkflowFile) -> Optional[str]:
+        """Return a workflow's JSON text without network I/O, if it is already cached"""
+        data = self.store.get_data(file.sha)
+        if data is None:
+            cached = self.cache.get(file.sha)
+            data = cached[0] if cached else None
+        # Summaries of large workflows are not the real document, so those are fetched on demand
+        if isinstance(data, bytes):
+            return data.decode("utf-8", "replace")
+        if data is not None and not self.analyzer.is_summary(data):
+            return json.dumps(data, indent=2)
+        return st.session_state.prepared_downloads.get(file.sha)
+    
+    def render_download_button(self, file: WorkflowFile, repo: WorkflowSource, label: str, key: str) -> None:
+        """Render a download button, fetching uncached content only after the user asks for it"""
+        text = self._cached_workflow_text(file)
+        if text is not None:
+            st.download_button(label=label, data=text, file_name=file.name, mime="application/json", key=key)
+            return
+        
+        if st.button("⬇️ Prepare Download", key=f"prepare_{key}"):
+            text = repo.fetch_raw_text(file)
+            if text is None:
+                st.error(f"Could not fetch {file.name}")
+                return
+            
+            prepared = st.session_state.prepared_downloads
+            prepared[file.sha] = text
+            while len(prepared) > PREPARED_DOWNLOADS_LIMIT:
+                prepared.pop(next(iter(prepared)))
+            rerun_fragment()
+    
+    def build_zip(self, files: List[WorkflowFile], repo: WorkflowSource, concurrency: int = BATCH_WORKERS) -> bytes:
+        """Bundle workflows into an in-memory ZIP, fetching uncached files in parallel"""
+        # Cached texts are resolved here, since session state is only reachable from the script thread
+        texts = {file.sha: self._cached_workflow_text(file) for file in files}
+        missing = [file for file in files if texts[file.sha] is None]
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for file, text in zip(missing, executor.map(repo.fetch_raw_text, missing)):
+                texts[file.sha] = text
         
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for file in files:
+                if texts[file.sha] is not None:
+                    archive.writestr(file.path, texts[file.sha])
+        return buffer.getvalue()
+    
+    def load_workflow(self, file: WorkflowFile, repo: WorkflowSource) -> bool:
+        """Load a single workflow from the cache or the repository"""
+        if self._load_from_cache(file):
+            return True
+        
+        data = repo.fetch_workflow_content(file)
+        if not data:
+            return False
+        
+        analysis = self.analyzer.analyze_workflow(data)
+        self.cache.put(file.sha, data, analysis)
+        self._store_workflow(file, data, analysis)
         return True
     
-    def load_workflows_batch(self, files: List[WorkflowFile], repo: GitHubRepository) -> None:
+    def _resolve_analysis(self, file: WorkflowFile, repo: WorkflowSource,
+                          pool: Optional[concurrent.futures.ProcessPoolExecutor],
+                          cancelled: Optional[threading.Event] = None) -> Optional[WorkflowAnalysis]:
+        """Resolve a workflow's analysis through this process's shared caches"""
+        return resolve_workflow_analysis(file, repo, self.cache, self.catalog, pool, store=self.store,
+                                         metrics=self.metrics, corpus_stats=self.corpus_stats, cancelled=cancelled)
+    
+    def _warm_workflow(self, file: WorkflowFile, repo: WorkflowSource,
+                       pool: Optional[concurrent.futures.ProcessPoolExecutor], cancelled: threading.Event) -> None:
+        """Resolve a workflow's analysis ahead of time, for prefetching"""
+        if cancelled.is_set():
+            return
+        try:
+            self._resolve_analysis(file, repo, pool, cancelled)
+        except RateLimitError:
+            # Later prefetches would hit the same limit; leave the remaining quota to the user
+            cancelled.set()
+        except Exception:
+            # Prefetching is best effort; a real load reports the error
+            pass
+    
+    def prefetch_pages(self, filtered_files: List[WorkflowFile], filters: Dict[str, Any],
+                       repo: WorkflowSource) -> None:
+        """Warm the pages after the current one in the background, cancelling work for stale filters"""
+        page_size = filters['items_per_page']
+        page = st.session_state.current_page
+        settings = tuple((key, value) for key, value in filters.items()
+                         if key not in ('token', 'show_diagnostics'))
+        signature = (repo.source_key, page, settings)
+        
+        current = st.session_state.get('prefetch')
+        if current and current[0] == signature:
+            return
+        if current:
+            current[1].cancel()
+        
+        # Only small documents are prefetched, and only downloads count against the byte budget
+        upcoming = []
+        budget = PREFETCH_BUDGET_BYTES
+        start = (page + 1) * page_size
+        for file in filtered_files[start:start + filters['prefetch_pages'] * page_size]:
+            if file.path in st.session_state.loaded_workflows or file.path in st.session_state.removed_workflows:
+                continue
+            if file.size > LARGE_WORKFLOW_BYTES:
+                continue
+            if file.sha not in self.cache:
+                if file.size > budget:
+                    break
+                budget -= file.size
+            upcoming.append(file)
+        st.session_state.prefetched_workflows.update(file.path for file in upcoming)
+        
+        pool = get_analysis_pool()
+        batch = get_page_prefetcher().submit(
+            upcoming, lambda file, cancelled: self._warm_workflow(file, repo, pool, cancelled))
+        st.session_state.prefetch = (signature, batch)
+    
+    def load_workflows_batch(self, files: List[WorkflowFile], repo: WorkflowSource,
+                             engine: str = "Threads", concurrency: int = BATCH_WORKERS) -> None:
         """Load multiple workflows with progress tracking"""
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
-            future_to_file = {
-                executor.submit(repo.fetch_workflow_content, file): file 
-                for file in files
-            }
+        completed = 0
+        successful = 0
+        
+        # Only blobs missing from the persistent cache need to be downloaded
+        files_to_fetch = []
+        for file in files:
+            if self._load_from_cache(file):
+                completed += 1
+                successful += 1
+            else:
+                files_to_fetch.append(file)
+        
+        if files:
+            progress_bar.progress(completed / len(files))
+            status_text.text(f"Loaded {completed}/{len(files)} workflows ({successful} from cache)")
+        
+        def finish(file: WorkflowFile, data: Optional[WorkflowPayload], analysis: Optional[WorkflowAnalysis],
+                   error: Optional[Exception]) -> None:
+            nonlocal completed, successful
+            if error is not None:
+                st.error(f"Error loading {file.name}: {str(error)}")
+            elif data:
+                if analysis is None:
+                    analysis = self.analyzer.analyze_workflow(data)
+                self.cache.put(file.sha, data, analysis)
+                self._store_workflow(file, data, analysis)
+                successful += 1
             
-            completed = 0
-            successful = 0
+            completed += 1
+            progress_bar.progress(completed / len(files))
+            status_text.text(f"Loaded {completed}/{len(files)} workflows ({successful} successful)")
+        
+        # Analysis stage: raw documents are parsed and analyzed in worker processes while fetching continues
+        pool = get_analysis_pool()
+        # Workers only return analysis fields; the raw bytes stay here and are what gets stored
+        analyzing: Dict[concurrent.futures.Future, Tuple[WorkflowFile, bytes]] = {}
+        
+        def finish_analysis(file: WorkflowFile, content: bytes, future: concurrent.futures.Future) -> None:
+            nonlocal pool
+            try:
+                try:
+                    fields = future.result()
+                except concurrent.futures.BrokenExecutor:
+                    if pool is not None:
+                        discard_analysis_pool(pool)
+                        pool = None
+                    # The crash may have been another document's; the content is still here to analyze
+                    fields = analyze_workflow_content(content)
+            except Exception as e:
+                finish(file, None, None, e)
+            else:
+                finish(file, content, WorkflowAnalysis.create(**fields), None)
+        
+        def record_result(file: WorkflowFile, payload: Optional[WorkflowPayload], error: Optional[Exception]) -> None:
+            nonlocal pool
+            if not isinstance(payload, bytes):
+                finish(file, payload, None, error)
+                return
             
-            for future in concurrent.futures.as_completed(future_to_file):
-                file = future_to_file[future]
+            future = concurrent.futures.Future()
+            if pool is not None:
+                try:
+                    future = pool.submit(analyze_workflow_content, payload)
+                except concurrent.futures.BrokenExecutor:
+                    # A crashed worker breaks the whole pool; start a fresh one on the next run
+                    discard_analysis_pool(pool)
+                    pool = None
+            if pool is None:
                 try:
-                    data = future.result()
-                    if data:
-                        st.session_state.workflows_data[file.name] = data
-                        st.session_state.loaded_analyses[file.name] = self.analyzer.analyze_workflow(data)
-                        successful += 1
+                    future.set_result(analyze_workflow_content(payload))
                 except Exception as e:
-                    st.error(f"Error loading {file.name}: {str(e)}")
-                
-                completed += 1
-                progress_bar.progress(completed / len(files))
-                status_text.text(f"Loaded {completed}/{len(files)} workflows ({successful} successful)")
+                    future.set_exception(e)
+            analyzing[future] = (file, payload)
+            
+            # Record whatever analyses are already done without blocking the fetch stage
+            for done in [f for f in analyzing if f.done()]:
+                finish_analysis(*analyzing.pop(done), done)
+        
+        # Archive and asyncio engines only apply to remote repositories
+        is_remote = isinstance(repo, GitHubRepository)
+        
+        try:
+            if engine == "Archive" and is_remote and files_to_fetch:
+                self._fetch_from_archive(files_to_fetch, repo, record_result)
+            elif engine == "Asyncio" and is_remote and aiohttp is not None:
+                repo.fetch_workflows_async(files_to_fetch, concurrency, record_result)
+            else:
+                self._fetch_with_threads(files_to_fetch, repo, concurrency, record_result)
+        except RateLimitError as e:
+            st.error(f"⏳ {str(e)}")
+        
+        for done in concurrent.futures.as_completed(list(analyzing)):
+            finish_analysis(*analyzing.pop(done), done)
         
         progress_bar.empty()
         status_text.empty()
         st.success(f"✅ Batch loading complete! {successful}/{len(files)} workflows loaded successfully.")
     
-    def generate_comprehensive_report(self, files: List[WorkflowFile]) -> None:
+    def _fetch_from_archive(self, files: List[WorkflowFile], repo: GitHubRepository,
+                            on_result: Callable[[WorkflowFile, Optional[WorkflowPayload], Optional[Exception]], None]) -> None:
+        """Parse workflows from a single streamed branch archive instead of per-file downloads"""
+        pending = {file.path: file for file in files}
+        
+        try:
+            for path, size, stream in repo.iter_archive_json_files():
+                file = pending.pop(path, None)
+                if file is None:
+                    continue
+                # Content is hashed as it is read, so a blob that is not the listed one is never stored under its SHA
+                reader = BlobHashingReader(stream, size)
+                try:
+                    if size <= LARGE_WORKFLOW_BYTES:
+                        data = reader.read()
+                    else:
+                        data = self.analyzer.parse_workflow(reader, size)
+                except JSON_ERRORS as e:
+                    on_result(file, None, e)
+                    continue
+                if reader.hexdigest() != file.sha:
+                    on_result(file, None, ValueError(f"{file.path} in the archive does not match the listed blob"))
+                else:
+                    on_result(file, data, None)
+                
+                if not pending:
+                    break
+        except (requests.RequestException, tarfile.TarError) as e:
+            st.error(f"Error reading repository archive: {str(e)}")
+        
+        # Files missing from the archive still count towards progress
+        for file in pending.values():
+            on_result(file, None, None)
+    
+    def _fetch_with_threads(self, files: List[WorkflowFile], repo: WorkflowSource, concurrency: int,
+                            on_result: Callable[[WorkflowFile, Optional[WorkflowPayload], Optional[Exception]], None]) -> None:
+        """Fetch workflows on a thread pool, reporting each result on the calling thread"""
+        def fetch(file: WorkflowFile) -> Optional[WorkflowPayload]:
+            # Large documents are still summarized while streaming; the rest go to the analysis stage raw
+            if file.size > LARGE_WORKFLOW_BYTES:
+                return repo.fetch_workflow_content(file)
+            return repo.fetch_workflow_bytes(file)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            future_to_file = {
+                executor.submit(fetch, file): file 
+                for file in files
+            }
+            
+            try:
+                for future in concurrent.futures.as_completed(future_to_file):
+                    file = future_to_file[future]
+                    try:
+                        payload = future.result()
+                    except RateLimitError:
+                        raise
+                    except Exception as e:
+                        on_result(file, None, e)
+                    else:
+                        # Outside the handler, so a failing callback is not reported as a second result
+                        on_result(file, payload, None)
+            finally:
+                # Remaining requests would hit the same limit
+                for pending in future_to_file:
+                    pending.cancel()
+    
+    def _corpus_summary(self, files: List[WorkflowFile], source_key: Optional[str]) -> Dict[str, Any]:
+        """Return report statistics for every analyzed workflow of the source, whichever session analyzed it"""
+        return self.corpus_stats.summary(source_key, files, self.catalog, self._analysis_for)
+    
+    def generate_comprehensive_report(self, files: List[WorkflowFile], source_key: Optional[str] = None) -> None:
         """Generate a comprehensive analysis report"""
-        if not st.session_state.loaded_analyses:
+        stats = self._corpus_summary(files, source_key)
+        
+        if not stats['total']:
             st.info("📥 Load some workflows first to generate a report.")
             return
         
         st.header("📊 Comprehensive Workflow Analysis Report")
-        
-        analyses = list(st.session_state.loaded_analyses.values())
+        analyzed_by = "other sessions or the indexer" if self.catalog else "other sessions of this server"
+        st.caption(f"Covers every analyzed workflow in {source_key}, including ones analyzed by {analyzed_by}, "
+                   f"regardless of the current filters or which workflows this session has loaded")
         
         # Summary metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Workflows", len(analyses))
+            st.metric("Total Workflows", stats['total'])
         with col2:
-            total_nodes = sum(a.node_count for a in analyses)
-            st.metric("Total Nodes", total_nodes)
+            st.metric("Total Nodes", stats['total_nodes'])
         with col3:
-            avg_nodes = total_nodes / len(analyses) if analyses else 0
+            avg_nodes = stats['total_nodes'] / stats['total']
             st.metric("Avg Nodes/Workflow", f"{avg_nodes:.1f}")
         with col4:
-            workflows_with_triggers = sum(1 for a in analyses if a.has_trigger)
-            st.metric("Workflows with Triggers", f"{workflows_with_triggers}/{len(analyses)}")
+            st.metric("Workflows with Triggers", f"{stats['with_triggers']}/{stats['total']}")
         
         # Distribution analysis
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("📈 Node Count Distribution")
-            node_counts = [a.node_count for a in analyses]
-            if node_counts:
-                st.write(f"• **Min nodes:** {min(node_counts)}")
-                st.write(f"• **Max nodes:** {max(node_counts)}")
-                st.write(f"• **Median nodes:** {sorted(node_counts)[len(node_counts)//2]}")
+            st.write(f"• **Min nodes:** {stats['min_nodes']}")
+            st.write(f"• **Max nodes:** {stats['max_nodes']}")
+            st.write(f"• **Median nodes:** {stats['median_nodes']}")
+            st.write("• **Percentiles:** " + ", ".join(f"p{p}: {value}" for p, value in stats['percentiles'].items()))
+            
+            counts, edges = stats['histogram']
+            st.bar_chart({
+                'Nodes': [f"{edges[i]:.0f}–{edges[i + 1]:.0f}" for i in range(len(counts))],
+                'Workflows': counts
+            }, x='Nodes', y='Workflows')
         
         with col2:
             st.subheader("🔧 Most Popular Node Types")
-            all_node_types = {}
-            for analysis in analyses:
-                for node_type in analysis.node_types:
-                    all_node_types[node_type] = all_node_types.get(node_type, 0) + 1
-            
-            if all_node_types:
-                sorted_types = sorted(all_node_types.items(), key=lambda x: x[1], reverse=True)[:10]
-                for i, (node_type, count) in enumerate(sorted_types, 1):
-                    st.write(f"{i}. **{node_type}**: {count} workflows")
+            for i, (node_type, count) in enumerate(stats['top_node_types'], 1):
+                st.write(f"{i}. **{node_type}**: {count} workflows")
+        
+        # Node types used together
+        node_types, matrix = stats['co_occurrence']
+        if len(node_types) > 1:
+            with st.expander("🔗 Node Type Co-occurrence"):
+                table = {'Node Type': node_types}
+                for column, node_type in enumerate(node_types):
+                    table[node_type] = [row[column] for row in matrix]
+                st.dataframe(table, hide_index=True)
+        
+        # Per-folder breakdown
+        if len(stats['folders']) > 1:
+            with st.expander("📂 Folder Breakdown"):
+                st.dataframe({
+                    'Folder': [folder for folder, _, _, _ in stats['folders']],
+                    'Workflows': [workflows for _, workflows, _, _ in stats['folders']],
+                    'Avg Nodes': [round(nodes / workflows, 1) for _, workflows, nodes, _ in stats['folders']],
+                    'With Triggers': [triggers for _, _, _, triggers in stats['folders']]
+                }, hide_index=True)
+        
+        # Copies and forks of the same template
+        groups = stats['duplicate_groups']
+        if groups:
+            with st.expander(f"🧬 Duplicate Workflows ({stats['redundant_workflows']} redundant copies)"):
+                identical = sum(1 for variants in groups if len(variants) == 1)
+                st.write(f"• **Unique workflows:** {stats['total'] - stats['redundant_workflows']} of {stats['total']}")
+                st.write(f"• **Distinct structures:** {stats['distinct_structures']}")
+                st.write(f"• **Groups:** {identical} identical, {len(groups) - identical} near-duplicate "
+                         f"(≥{NEAR_DUPLICATE_SIMILARITY:.0%} similar)")
+                examples = []
+                for variants in groups:
+                    paths = [path for variant in variants for path in variant]
+                    listed = ", ".join(paths[:DUPLICATE_PATH_EXAMPLES])
+                    hidden = len(paths) - DUPLICATE_PATH_EXAMPLES
+                    examples.append(f"{listed} (+{hidden} more)" if hidden > 0 else listed)
+                st.dataframe({
+                    'Workflows': [sum(len(variant) for variant in variants) for variants in groups],
+                    'Kind': ["Identical" if len(variants) == 1 else "Near-duplicate" for variants in groups],
+                    'Structures': [len(variants) for variants in groups],
+                    'Paths': examples
+                }, hide_index=True)
     
     def run(self):
         """Main application entry point"""
@@ -452,41 +2996,62 @@ class WorkflowManager:
         # Sidebar filters
         with st.sidebar:
             filters = self.ui.render_sidebar_filters()
+            if filters['show_diagnostics']:
+                self.ui.render_diagnostics(self.metrics)
         
-        # Initialize repository
-        repo = GitHubRepository(filters['owner'], filters['repo'], filters['branch'])
+        # Initialize workflow source
+        if filters['source_type'] == "Local directory":
+            local_path = resolve_local_path(filters['local_path'])
+            if local_path is None:
+                st.error(f"Local directories must be inside {DEFAULT_LOCAL_PATH}")
+                return
+            repo = LocalWorkflowSource(local_path)
+        else:
+            repo = GitHubRepository(filters['owner'], filters['repo'], filters['branch'], token=filters['token'],
+                                    pool_size=filters['concurrency'])
         
         # Control buttons
-        col1, col2, col3, col4 = st.columns(4)
+        col1, col2, col3 = st.columns(3)
         
         with col1:
             if st.button("🔍 Scan Repository", type="primary"):
-                st.cache_data.clear()
+                repo.invalidate_listing()
+                st.session_state.failed_analyses = {}
                 st.rerun()
         
         with col2:
             scan_and_load = st.button("📥 Scan & Load All")
         
         with col3:
-            if st.button("🗑️ Clear Cache"):
-                st.cache_data.clear()
-                st.session_state.workflows_data = {}
+            if st.button("🗑️ Clear Session", help="Unload this session's workflows and rescan; "
+                         "caches shared with other sessions are kept"):
+                repo.invalidate_listing()
+                st.session_state.loaded_workflows = {}
                 st.session_state.loaded_analyses = {}
-                st.success("Cache cleared!")
-        
-        with col4:
-            if st.button("📊 Generate Report"):
-                st.session_state.show_report = True
+                st.session_state.removed_workflows = set()
+                st.session_state.prefetched_workflows = set()
+                st.session_state.failed_analyses = {}
+                st.session_state.search_index = SearchIndex()
+                st.success("Session cleared!")
         
         # Get all JSON files
         with st.spinner("🔍 Scanning repository for JSON files..."):
-            files = repo.get_all_json_files()
+            try:
+                with self.metrics.timer("discover"):
+                    files = repo.get_all_json_files()
+            except RateLimitError as e:
+                st.error(f"⏳ {str(e)}")
+                return
         
         if not files:
             st.warning("⚠️ No JSON files found in the repository. Check your repository settings.")
             return
         
         st.success(f"📁 Found **{len(files)}** JSON files across all directories")
+        if self.catalog:
+            self.catalog.sync_files(repo.source_key, files)
+        else:
+            st.session_state.search_index.sync_files(files)
         
         # Show folder structure summary
         folders = {}
@@ -504,105 +3069,174 @@ class WorkflowManager:
         
         # Scan and load all functionality
         if scan_and_load:
-            self.load_workflows_batch(files, repo)
+            with self.metrics.timer("batch_load", files=len(files), engine=filters['fetch_engine']):
+                self.load_workflows_batch(files, repo, filters['fetch_engine'], filters['concurrency'])
         
         # Apply filters
-        filtered_files = self.filter_workflows(files, filters)
+        with self.metrics.timer("filter", files=len(files)):
+            filtered_files, pending = self.filter_workflows(files, filters, repo)
         
         if len(filtered_files) != len(files):
             st.info(f"🔍 Showing {len(filtered_files)} of {len(files)} files after applying filters")
+        if self.has_analysis_filters(filters):
+            self.render_filter_status(files, pending)
+        
+        # Cards, pagination and the report rerun on their own, so their clicks skip listing and filtering
+        self.render_page(filtered_files, repo, filters)
+        self.render_report_section(files, repo.source_key)
+    
+    def render_filter_status(self, files: List[WorkflowFile], pending: Dict[str, concurrent.futures.Future]) -> None:
+        """Show the analyses node filters are waiting for, and the workflows they had to hide"""
+        if pending:
+            self.render_pending_analyses(pending)
+        
+        failed = st.session_state.failed_analyses
+        reasons = [failed[file.sha] for file in files if file.sha in failed]
+        rate_limit = next((reason for reason in reasons if reason), None)
+        if rate_limit:
+            st.error(f"⏳ {rate_limit}")
+        if reasons:
+            st.caption(f"{len(reasons)} file(s) could not be analyzed and are hidden by the node filters.")
+    
+    @polling_fragment(ANALYSIS_POLL_INTERVAL)
+    def render_pending_analyses(self, pending: Dict[str, concurrent.futures.Future]) -> None:
+        """Report analyses still running for the node filters, rerunning the app as each batch finishes"""
+        if any(future.done() for future in pending.values()):
+            # A full rerun filters the finished workflows in; the rest keep resolving
+            st.rerun()
+        
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.info(f"⏳ Analyzing {len(pending)} workflows for the node filters; "
+                    "matching ones appear as they finish.")
+        with col2:
+            if st.button("🔄 Refresh results", key="refresh_filter_results"):
+                st.rerun()
+    
+    @staticmethod
+    def _turn_page(step: int, total_pages: int) -> None:
+        st.session_state.current_page = max(0, min(st.session_state.current_page + step, total_pages - 1))
+    
+    @fragment
+    def render_page(self, filtered_files: List[WorkflowFile], repo: WorkflowSource, filters: Dict[str, Any]) -> None:
+        """Render the pagination controls and the cards of the current page"""
+        if not filtered_files:
+            st.info("🔍 No workflows match your current filters. Try adjusting your search criteria.")
+            self.prefetch_pages(filtered_files, filters, repo)
+            return
         
         # Pagination
-        total_pages = (len(filtered_files) - 1) // filters['items_per_page'] + 1 if filtered_files else 1
+        total_pages = (len(filtered_files) - 1) // filters['items_per_page'] + 1
+        # Filters may have shrunk the results since the page was chosen
+        st.session_state.current_page = min(st.session_state.current_page, total_pages - 1)
         
         if total_pages > 1:
             col1, col2, col3 = st.columns([1, 2, 1])
             with col1:
-                if st.button("⬅️ Previous") and st.session_state.current_page > 0:
-                    st.session_state.current_page -= 1
+                st.button("⬅️ Previous", on_click=self._turn_page, args=(-1, total_pages))
             with col2:
                 st.markdown(f"<div style='text-align: center'>Page {st.session_state.current_page + 1} of {total_pages}</div>", unsafe_allow_html=True)
             with col3:
-                if st.button("➡️ Next") and st.session_state.current_page < total_pages - 1:
-                    st.session_state.current_page += 1
+                st.button("➡️ Next", on_click=self._turn_page, args=(1, total_pages))
         
         # Display workflows
-        if filtered_files:
-            start_idx = st.session_state.current_page * filters['items_per_page']
-            end_idx = min(start_idx + filters['items_per_page'], len(filtered_files))
-            current_files = filtered_files[start_idx:end_idx]
-            
+        start_idx = st.session_state.current_page * filters['items_per_page']
+        end_idx = min(start_idx + filters['items_per_page'], len(filtered_files))
+        current_files = filtered_files[start_idx:end_idx]
+        
+        # Page ZIPs are only built on request and kept until the page changes
+        page_key = tuple(f.sha for f in current_files)
+        page_zip = st.session_state.get('page_zip')
+        if page_zip and page_zip[0] == page_key:
+            st.download_button("📦 Download page as ZIP", data=page_zip[1], file_name="workflows.zip",
+                               mime="application/zip", key="download_page_zip")
+        elif st.button("📦 Prepare page ZIP"):
+            with st.spinner(f"Bundling {len(current_files)} workflows..."):
+                st.session_state.page_zip = (page_key, self.build_zip(current_files, repo, filters['concurrency']))
+            rerun_fragment()
+        
+        # Loading or removing a workflow changes which ones node filters match, not just its card
+        full_rerun = self.has_analysis_filters(filters)
+        with self.metrics.timer("render", cards=len(current_files)):
             for file in current_files:
-                # Load individual workflow if not loaded
-                if file.name not in st.session_state.workflows_data:
-                    col1, col2, col3 = st.columns([2, 1, 1])
-                    
-                    with col1:
-                        st.markdown(f"### 📋 {file.name}")
-                        st.caption(f"Path: {file.path}")
-                    
-                    with col2:
-                        if st.button(f"📥 Load", key=f"load_{file.sha}"):
-                            with st.spinner(f"Loading {file.name}..."):
-                                data = repo.fetch_workflow_content(file)
-                                if data:
-                                    st.session_state.workflows_data[file.name] = data
-                                    st.session_state.loaded_analyses[file.name] = self.analyzer.analyze_workflow(data)
-                                    st.rerun()
-                    
-                    with col3:
-                        st.download_button(
-                            label="⬇️ Download",
-                            data=requests.get(file.download_url).text,
-                            file_name=file.name,
-                            mime="application/json",
-                            key=f"download_{file.sha}"
-                        )
-                else:
-                    # Display loaded workflow
-                    analysis = st.session_state.loaded_analyses.get(file.name) if filters['show_analysis'] else None
-                    self.ui.render_workflow_card(file, analysis, repo)
-                    
-                    # Action buttons
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        workflow_data = st.session_state.workflows_data[file.name]
-                        st.download_button(
-                            label="⬇️ Download JSON",
-                            data=json.dumps(workflow_data, indent=2),
-                            file_name=file.name,
-                            mime="application/json",
-                            key=f"download_loaded_{file.sha}"
-                        )
-                    
-                    with col2:
-                        if st.button("📋 Copy Raw URL", key=f"copy_{file.sha}"):
-                            st.code(f"{repo.raw_base_url}/{file.path}")
-                            st.info("✅ Raw URL displayed above")
-                    
-                    with col3:
-                        if st.button("🗑️ Remove", key=f"remove_{file.sha}"):
-                            if file.name in st.session_state.workflows_data:
-                                del st.session_state.workflows_data[file.name]
-                            if file.name in st.session_state.loaded_analyses:
-                                del st.session_state.loaded_analyses[file.name]
-                            st.rerun()
-                
-                st.divider()
+                self.render_card(file, repo, filters['show_analysis'], full_rerun)
+        
+        self.prefetch_pages(filtered_files, filters, repo)
+    
+    @staticmethod
+    def _rerun_card(full_rerun: bool) -> None:
+        """Redraw after a card action: the whole app when filters depend on it, otherwise just the card"""
+        if full_rerun:
+            st.rerun()
+        rerun_fragment()
+    
+    @fragment
+    def render_card(self, file: WorkflowFile, repo: WorkflowSource, show_analysis: bool,
+                    full_rerun: bool = False) -> None:
+        """Render one workflow with its actions, which only redraw this card unless full_rerun is set"""
+        # Workflows this session prefetched show as loaded once warm, unless removed here since
+        if (file.path in st.session_state.prefetched_workflows and file.path not in st.session_state.loaded_workflows
+                and file.path not in st.session_state.removed_workflows):
+            analysis = self.store.get_analysis(file.sha)
+            if analysis is not None:
+                self._reference_workflow(file, analysis)
+        
+        # Load individual workflow if not loaded
+        if file.path not in st.session_state.loaded_workflows:
+            col1, col2, col3 = st.columns([2, 1, 1])
+            
+            with col1:
+                st.markdown(f"### 📋 {file.name}")
+                st.caption(f"Path: {file.path}")
+            
+            with col2:
+                if st.button(f"📥 Load", key=f"load_{file.sha}"):
+                    with st.spinner(f"Loading {file.name}..."):
+                        try:
+                            if self.load_workflow(file, repo):
+                                self._rerun_card(full_rerun)
+                        except RateLimitError as e:
+                            st.error(f"⏳ {str(e)}")
+            
+            with col3:
+                self.render_download_button(file, repo, "⬇️ Download", f"download_{file.sha}")
         else:
-            st.info("🔍 No workflows match your current filters. Try adjusting your search criteria.")
+            # Display loaded workflow
+            analysis = st.session_state.loaded_analyses.get(file.path) if show_analysis else None
+            self.ui.render_workflow_card(file, analysis, repo)
+            
+            # Action buttons
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                self.render_download_button(file, repo, "⬇️ Download JSON", f"download_loaded_{file.sha}")
+            
+            with col2:
+                if st.button("📋 Copy Raw URL", key=f"copy_{file.sha}"):
+                    st.code(repo.get_raw_url(file))
+                    st.info("✅ Raw URL displayed above")
+            
+            with col3:
+                if st.button("🗑️ Remove", key=f"remove_{file.sha}"):
+                    self._forget_workflow(file)
+                    self._rerun_card(full_rerun)
         
-        # Generate report if requested
-        if st.session_state.get('show_report', False):
-            st.session_state.show_report = False
-            self.generate_comprehensive_report(filtered_files)
+        st.divider()
+    
+    @fragment
+    def render_report_section(self, files: List[WorkflowFile], source_key: Optional[str]) -> None:
+        """Render the report button and, once clicked, the report for every listed file of the source"""
+        if st.button("📊 Generate Source Report"):
+            with self.metrics.timer("report", files=len(files)):
+                self.generate_comprehensive_report(files, source_key)
 
 # Application entry point
 def main():
     """Main application entry point"""
-    app = WorkflowManager()
-    app.run()
+    # Timed in a finally block, since st.rerun() leaves the script by raising
+    with get_metrics().timer("rerun"):
+        app = WorkflowManager()
+        app.run()
 
 if __name__ == "__main__":
     main()
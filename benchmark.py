@@ -0,0 +1,312 @@
+"""Benchmark the discovery -> fetch -> analyze -> filter -> report pipeline of a2pp.py without a browser
+
+The workflow JSON files next to this script are used as seeds and scaled into synthetic corpora,
+served by a local stand-in for the GitHub API and raw content hosts.
+
+    python benchmark.py                      # 10k and 100k workflow corpora
+    python benchmark.py --sizes 2000 --json results.json
+"""
+import argparse
+import copy
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import concurrent.futures
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Tuple
+from urllib.parse import urlparse, unquote
+
+SEED_DIR = Path(__file__).resolve().parent
+OWNER = "bench"
+FOLDERS = 50
+
+# Representative sidebar filters for the filter stage
+FILTER_CASES = {
+    'search': {'search_term': 'email', 'folder_filter': '', 'node_type_filter': '', 'min_nodes': 0, 'max_nodes': 500},
+    'folder': {'search_term': '', 'folder_filter': 'team-07', 'node_type_filter': '', 'min_nodes': 0, 'max_nodes': 500},
+    'node_type': {'search_term': '', 'folder_filter': '', 'node_type_filter': 'http', 'min_nodes': 0, 'max_nodes': 500},
+    'node_range': {'search_term': '', 'folder_filter': '', 'node_type_filter': '', 'min_nodes': 10, 'max_nodes': 40},
+    'combined': {'search_term': 'slack', 'folder_filter': 'team-1', 'node_type_filter': 'trigger',
+                 'min_nodes': 5, 'max_nodes': 100},
+}
+
+class SyntheticCorpus:
+    """Class to derive a deterministic corpus of distinct workflows from the seed files"""
+
+    def __init__(self, size: int, seed_dir: Path = SEED_DIR):
+        self.size = size
+        self.seeds: List[Tuple[str, Dict[str, Any]]] = []
+        for path in sorted(seed_dir.glob("*.json")):
+            data = json.loads(path.read_bytes())
+            if isinstance(data, dict) and data.get('nodes'):
+                self.seeds.append((path.stem, data))
+        if not self.seeds:
+            raise SystemExit(f"No seed workflows found in {seed_dir}")
+        self.paths = [self.path(i) for i in range(size)]
+        self._index = {path: i for i, path in enumerate(self.paths)}
+
+    def path(self, i: int) -> str:
+        seed_name = self.seeds[i % len(self.seeds)][0]
+        return f"team-{i % FOLDERS:02d}/{i:06d}-{seed_name}.json"
+
+    def index_of(self, path: str) -> Optional[int]:
+        return self._index.get(path)
+
+    def document(self, i: int) -> bytes:
+        """Return variant i: a renamed seed with a deterministic share of its nodes kept"""
+        seed_name, seed = self.seeds[i % len(self.seeds)]
+        rng = random.Random(i)
+        data = copy.deepcopy(seed)
+        nodes = data['nodes']
+        keep = max(1, int(len(nodes) * rng.uniform(0.6, 1.0)))
+        data['nodes'] = nodes[:keep]
+        data['name'] = f"{seed.get('name', seed_name)} #{i}"
+        data['id'] = f"bench{i:08d}"
+        return json.dumps(data).encode("utf-8")
+
+def blob_sha(content: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+class CorpusServer:
+    """Class to serve a synthetic corpus through the GitHub API and raw content URL layouts"""
+
+    def __init__(self, corpora: Dict[str, SyntheticCorpus]):
+        self.corpora = corpora
+        self._trees: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def send(self, status: int, body: bytes, content_type: str = "application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parts = unquote(urlparse(self.path).path).strip("/").split("/")
+                corpus = server.corpora.get(parts[2]) if len(parts) > 2 else None
+                if corpus is None:
+                    return self.send(404, b"{}")
+                if parts[0] == "repos" and parts[3:4] == ["commits"]:
+                    return self.send(200, hashlib.sha1(parts[2].encode()).hexdigest().encode(), "text/plain")
+                if parts[0] == "repos" and parts[3:5] == ["git", "trees"]:
+                    return self.send(200, server.tree(parts[2]))
+                if parts[0] == "raw":
+                    index = corpus.index_of("/".join(parts[4:]))
+                    if index is not None:
+                        return self.send(200, corpus.document(index), "text/plain")
+                self.send(404, b"{}")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def tree(self, repo: str) -> bytes:
+        with self._lock:
+            if repo not in self._trees:
+                corpus = self.corpora[repo]
+                entries = []
+                for i, path in enumerate(corpus.paths):
+                    content = corpus.document(i)
+                    entries.append({'path': path, 'type': 'blob', 'sha': blob_sha(content), 'size': len(content)})
+                self._trees[repo] = json.dumps({'tree': entries, 'truncated': False}).encode("utf-8")
+            return self._trees[repo]
+
+    def close(self) -> None:
+        self._server.shutdown()
+
+class Stage:
+    """Class to collect per-operation latencies and the peak traced memory of one pipeline stage"""
+
+    def __init__(self, name: str, unit: str):
+        self.name = name
+        self.unit = unit
+        self.latencies: List[float] = []
+        self.items = 0
+        self.elapsed = 0.0
+        self.peak_bytes = 0
+        self._started = 0.0
+
+    def __enter__(self) -> "Stage":
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.elapsed = time.perf_counter() - self._started
+        if tracemalloc.is_tracing():
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+
+    def time(self, operation: Callable[[], Any], items: int = 1) -> Any:
+        started = time.perf_counter()
+        result = operation()
+        self.latencies.append(time.perf_counter() - started)
+        self.items += items
+        return result
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            'stage': self.name,
+            'operations': len(self.latencies),
+            'throughput': self.items / self.elapsed if self.elapsed else 0.0,
+            'unit': self.unit,
+            'mean_ms': statistics.fmean(self.latencies) * 1000 if self.latencies else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'peak_mb': self.peak_bytes / 2 ** 20
+        }
+
+def reset_session(st) -> None:
+    """Start each corpus from an empty session, as a new browser tab would"""
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+def run_corpus(app, st, server: CorpusServer, repo_name: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    corpus = server.corpora[repo_name]
+    reset_session(st)
+    manager = app.WorkflowManager()
+    if args.no_catalog:
+        manager.catalog = None
+
+    repo = app.GitHubRepository(OWNER, repo_name, pool_size=args.concurrency)
+    repo.api_base_url = f"http://127.0.0.1:{server.port}/repos/{OWNER}/{repo_name}"
+    repo.raw_base_url = f"http://127.0.0.1:{server.port}/raw/{OWNER}/{repo_name}"
+    server.tree(repo_name)  # Build the listing outside the timed region
+    stages = []
+
+    # Discovery: a cold listing every time, plus syncing it into the catalog or search index
+    with Stage("discover", "files/s") as stage:
+        for _ in range(args.repeats):
+            repo.invalidate_listing()
+            files = stage.time(repo.get_all_json_files, items=corpus.size)
+    stages.append(stage)
+
+    with Stage("index", "files/s") as stage:
+        if manager.catalog:
+            stage.time(lambda: manager.catalog.sync_files(repo.source_key, files), items=len(files))
+        else:
+            stage.time(lambda: st.session_state.search_index.sync_files(files), items=len(files))
+    stages.append(stage)
+
+    # Fetch: raw downloads of a sample on a thread pool, timed per request
+    sample = random.Random(0).sample(files, min(args.fetch_sample, len(files)))
+    with Stage("fetch", "docs/s") as stage:
+        def fetch(file):
+            started = time.perf_counter()
+            content = repo.fetch_workflow_bytes(file)
+            return time.perf_counter() - started, len(content or b"")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            for latency, _ in executor.map(fetch, sample):
+                stage.latencies.append(latency)
+                stage.items += 1
+    stages.append(stage)
+
+    # Analyze every document (generation is not timed), then ingest it into the store, catalog and session
+    analyze = Stage("analyze", "docs/s")
+    ingest = Stage("ingest", "docs/s")
+    with analyze:
+        for file in files:
+            content = corpus.document(corpus.index_of(file.path))
+            fields = analyze.time(lambda: app.analyze_workflow_content(content))
+            analysis = app.WorkflowAnalysis.create(**fields)
+            ingest.time(lambda: manager._store_workflow(file, content, analysis))
+    # Both stages share one loop, so throughput uses summed operation time and the peak is shared
+    for stage in (analyze, ingest):
+        stage.elapsed = sum(stage.latencies)
+    ingest.peak_bytes = analyze.peak_bytes
+    stages.extend([analyze, ingest])
+
+    # Filter: each representative query, repeatedly
+    with Stage("filter", "queries/s") as stage:
+        matches = {}
+        for _ in range(args.repeats):
+            for case, filters in FILTER_CASES.items():
+                matches[case] = len(stage.time(lambda: manager.filter_workflows(files, filters, repo)[0]))
+    stage.matches = matches
+    stages.append(stage)
+
+    # Report: the cold build of the report columns, then the per-click summary of the live columns
+    with Stage("seed", "rows/s") as stage:
+        for _ in range(args.repeats):
+            manager.corpus_stats = app.CorpusStatsCache()
+            stage.time(lambda: manager._corpus_summary(files, repo.source_key), items=len(files))
+    stages.append(stage)
+
+    with Stage("report", "reports/s") as stage:
+        for _ in range(args.repeats):
+            stage.time(lambda: manager._corpus_summary(files, repo.source_key))
+    stages.append(stage)
+
+    return stages
+
+def print_results(size: int, stages: List[Stage]) -> None:
+    print(f"\n== {size:,} workflows")
+    print(f"{'stage':<10}{'ops':>8}{'throughput':>22}{'p50 ms':>10}{'p99 ms':>10}{'peak MB':>10}")
+    for stage in stages:
+        result = stage.result()
+        throughput = f"{result['throughput']:,.1f} {result['unit']}"
+        print(f"{result['stage']:<10}{result['operations']:>8}{throughput:>22}"
+              f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['peak_mb']:>10.1f}")
+        if getattr(stage, 'matches', None):
+            print(" " * 10 + "matches: " + ", ".join(f"{case}={count}" for case, count in stage.matches.items()))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated corpus sizes")
+    parser.add_argument("--fetch-sample", type=int, default=2000, help="Documents downloaded in the fetch stage")
+    parser.add_argument("--concurrency", type=int, default=16, help="Download threads in the fetch stage")
+    parser.add_argument("--repeats", type=int, default=5, help="Repetitions of the discover, filter and report stages")
+    parser.add_argument("--no-catalog", action="store_true", help="Benchmark the in-memory search index instead of SQLite")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc, which slows every stage down")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    # The app reads its cache locations at import time, so point them at a scratch directory first
+    with tempfile.TemporaryDirectory(prefix="toolkitflow-bench-") as scratch:
+        os.environ["TOOLKITFLOW_CACHE_DIR"] = scratch
+        os.environ.setdefault("TOOLKITFLOW_ANALYSIS_WORKERS", "0")
+        sys.path.insert(0, str(SEED_DIR))
+        import streamlit as st
+        import a2pp as app
+
+        sizes = [int(size) for size in args.sizes.split(",") if size]
+        server = CorpusServer({f"corpus-{size}": SyntheticCorpus(size) for size in sizes})
+        if not args.no_memory:
+            tracemalloc.start()
+
+        results = []
+        try:
+            for size in sizes:
+                stages = run_corpus(app, st, server, f"corpus-{size}", args)
+                print_results(size, stages)
+                results.extend({'corpus_size': size, **stage.result()} for stage in stages)
+        finally:
+            server.close()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"\nWrote {args.json}")
+
+if __name__ == "__main__":
+    main()
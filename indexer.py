@@ -0,0 +1,141 @@
+"""Index a GitHub repository or local directory of n8n workflows without a browser session
+
+Workflows are fetched and analyzed in parallel into the same persistent disk cache and SQLite catalog
+that a2pp.py reads, so the UI opens an indexed source with its filters and report already populated.
+Progress is committed per workflow, so an interrupted or rate-limited run resumes where it stopped.
+
+    python indexer.py owner/repo --branch main --jobs 32
+    python indexer.py ./workflows
+"""
+import argparse
+import concurrent.futures
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROGRESS_INTERVAL = 5  # Seconds between progress lines
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="GitHub repository as owner/repo, or a local directory")
+    parser.add_argument("--branch", default="main", help="Git branch to index (GitHub sources)")
+    parser.add_argument("--token", help="GitHub token; defaults to the GITHUB_TOKEN environment variable")
+    parser.add_argument("--jobs", type=int, default=16, help="Workflows fetched and analyzed concurrently")
+    parser.add_argument("--analysis-workers", type=int,
+                        help="Analysis processes (0 analyzes on the fetch threads); defaults to the CPU count")
+    parser.add_argument("--full", action="store_true", help="Re-check every workflow instead of only unindexed ones")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+class Progress:
+    """Class to count indexing outcomes across fetch threads and report them periodically"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._reported = self._started
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            self.done += 1
+            self.failed += not ok
+            now = time.monotonic()
+            if now - self._reported >= PROGRESS_INTERVAL or self.done == self.total:
+                self._reported = now
+                print(self.line(), flush=True)
+
+    def line(self) -> str:
+        elapsed = time.monotonic() - self._started
+        rate = self.done / elapsed if elapsed else 0.0
+        return f"{self.done:,}/{self.total:,} indexed, {self.failed:,} failed ({rate:,.1f} workflows/s)"
+
+def main() -> int:
+    args = parse_args()
+    if args.analysis_workers is not None:
+        # The app reads its settings at import time
+        os.environ["TOOLKITFLOW_ANALYSIS_WORKERS"] = str(args.analysis_workers)
+
+    # Running outside `streamlit run` makes the app's cached getters log a warning
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+    import a2pp as app
+
+    if Path(args.source).is_dir():
+        repo = app.LocalWorkflowSource(args.source)
+    elif args.source.count("/") == 1:
+        owner, name = args.source.split("/")
+        repo = app.GitHubRepository(owner, name, args.branch, token=args.token, pool_size=args.jobs)
+    else:
+        print(f"{args.source} is neither a directory nor owner/repo", file=sys.stderr)
+        return 1
+
+    cache = app.get_workflow_cache()
+    catalog = app.get_workflow_catalog()
+    try:
+        files = repo.get_all_json_files()
+    except app.RateLimitError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    if not files:
+        print(f"No JSON files found in {repo.source_key}", file=sys.stderr)
+        return 1
+
+    # The catalog remembers which blobs are analyzed, which is what makes runs resumable
+    if catalog:
+        catalog.sync_files(repo.source_key, files)
+        if not args.full:
+            pending_paths = catalog.unanalyzed_paths(repo.source_key)
+            files = [file for file in files if file.path in pending_paths]
+    else:
+        print("SQLite catalog unavailable; only the disk cache will be filled", file=sys.stderr)
+
+    print(f"{repo.source_key}: {len(files):,} workflows to index", flush=True)
+    if not files:
+        return 0
+
+    pool = app.get_analysis_pool()
+    pool_state: Dict[str, Optional[concurrent.futures.ProcessPoolExecutor]] = {'pool': pool}
+    progress = Progress(len(files))
+
+    def index(file: app.WorkflowFile) -> None:
+        try:
+            analysis = app.resolve_workflow_analysis(file, repo, cache, catalog, pool_state['pool'])
+        except concurrent.futures.BrokenExecutor:
+            # A crashed worker takes the pool down; carry on analyzing on the fetch threads
+            pool_state['pool'] = None
+            analysis = app.resolve_workflow_analysis(file, repo, cache, catalog)
+        progress.record(analysis is not None)
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs)
+    futures: List[concurrent.futures.Future] = [executor.submit(index, file) for file in files]
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except app.RateLimitError as e:
+                print(f"{e} Run again later to resume.", file=sys.stderr)
+                return 2
+            except Exception as e:
+                print(f"Indexing failed: {e}", file=sys.stderr)
+                progress.record(False)
+    except KeyboardInterrupt:
+        print(f"Interrupted at {progress.line()}; run again to resume.", file=sys.stderr)
+        return 130
+    finally:
+        # Workflows already in flight finish, so everything reported as indexed is committed
+        executor.shutdown(wait=True, cancel_futures=True)
+        if pool is not None:
+            pool.shutdown()
+
+    return 1 if progress.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
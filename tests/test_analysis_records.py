@@ -0,0 +1,42 @@
+import json
+
+from a2pp import (LocalWorkflowSource, SharedWorkflowStore, WorkflowCache, WorkflowCatalog,
+                  resolve_workflow_analysis)
+
+WORKFLOW = {
+    'name': 'Noted',
+    'nodes': [
+        {'name': 'Trigger', 'type': 'n8n-nodes-base.manualTrigger'},
+        {'name': 'Note', 'type': 'n8n-nodes-base.stickyNote',
+         'parameters': {'content': 'Rotate the quarterly credentials ' * 20}},
+    ],
+    'connections': {},
+}
+FILTERS = {'search_term': 'quarterly', 'folder_filter': '', 'min_nodes': 0, 'max_nodes': 500, 'node_type_filter': ''}
+
+
+def resolve(tmp_path, catalog):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "noted.json").write_text(json.dumps(WORKFLOW))
+    source = LocalWorkflowSource(str(tmp_path / "src"))
+    file = source._scan(source.root)[0]
+    store = SharedWorkflowStore()
+    if catalog:
+        catalog.sync_files(source.source_key, [file])
+    analysis = resolve_workflow_analysis(file, source, WorkflowCache(tmp_path / "cache"), catalog, store=store)
+    return source, file, store, analysis
+
+
+def test_records_in_memory_drop_notes_the_catalog_indexed(tmp_path):
+    catalog = WorkflowCatalog(tmp_path / "catalog.sqlite3")
+    source, file, store, analysis = resolve(tmp_path, catalog)
+    
+    assert analysis.sticky_notes == () and store.get_analysis(file.sha) is analysis
+    assert catalog.filter_paths(source.source_key, FILTERS) == {file.path}
+    # The disk cache keeps the full record, so a rebuilt catalog can index the notes again
+    assert WorkflowCache(tmp_path / "cache").get(file.sha)[1].sticky_notes
+
+
+def test_records_keep_notes_without_a_catalog(tmp_path):
+    _, _, _, analysis = resolve(tmp_path, None)
+    assert analysis.sticky_notes[0].startswith('Rotate the quarterly credentials')
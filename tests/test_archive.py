@@ -0,0 +1,18 @@
+import io
+import json
+
+from a2pp import BlobHashingReader, LocalWorkflowSource, WorkflowAnalyzer
+
+
+def test_reader_hashes_like_git_even_when_partly_read():
+    content = json.dumps({'name': 'Archived', 'nodes': [], 'connections': {}, 'pinData': {'x': 'y' * 5000}}).encode()
+    reader = BlobHashingReader(io.BytesIO(content), len(content))
+    assert reader.read(10) == content[:10]
+    assert reader.hexdigest() == LocalWorkflowSource.compute_blob_sha(content)
+
+
+def test_streamed_summary_still_hashes_the_whole_blob():
+    content = json.dumps({'name': 'Large', 'nodes': [{'name': 'A', 'type': 't'}], 'connections': {}}).encode()
+    reader = BlobHashingReader(io.BytesIO(content + b' ' * 100), len(content) + 100)
+    assert WorkflowAnalyzer._summarize_stream(reader)['name'] == 'Large'
+    assert reader.hexdigest() == LocalWorkflowSource.compute_blob_sha(content + b' ' * 100)
@@ -0,0 +1,119 @@
+import sqlite3
+
+import numpy as np
+
+from a2pp import CorpusStats, CorpusStatsCache, WorkflowAnalysis, WorkflowCatalog, WorkflowFile
+
+
+def make_analysis(node_count, node_types=(), has_trigger=False):
+    return WorkflowAnalysis.create(node_types=node_types, name='Workflow', node_count=node_count,
+                                   connection_count=max(node_count - 1, 0), has_trigger=has_trigger,
+                                   created_at=None, updated_at=None, description=None)
+
+
+def test_percentiles_land_on_actual_node_counts():
+    counts = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5]
+    stats = CorpusStats()
+    for i, count in enumerate(counts):
+        stats.add(f"w{i}.json", make_analysis(count))
+    
+    summary = stats.summary()
+    assert summary['total'] == len(counts)
+    assert summary['total_nodes'] == sum(counts)
+    assert (summary['min_nodes'], summary['max_nodes']) == (1, 9)
+    for percentile, value in summary['percentiles'].items():
+        assert value == np.percentile(counts, percentile, method='higher')
+    assert summary['median_nodes'] == summary['percentiles'][50]
+
+
+def test_remove_and_replace_update_the_aggregates():
+    stats = CorpusStats()
+    stats.add("a.json", make_analysis(2, has_trigger=True))
+    stats.add("b.json", make_analysis(8))
+    stats.add("b.json", make_analysis(4))
+    stats.remove("a.json")
+    stats.remove("missing.json")
+    
+    summary = stats.summary()
+    assert summary['total'] == 1
+    assert summary['total_nodes'] == 4
+    assert summary['with_triggers'] == 0
+    assert summary['percentiles'][50] == 4
+
+
+def test_co_occurrence_counts_workflows_using_both_types():
+    stats = CorpusStats()
+    stats.add("a.json", make_analysis(2, ['test.http', 'test.slack']))
+    stats.add("b.json", make_analysis(2, ['test.http', 'test.set']))
+    stats.add("c.json", make_analysis(1, ['test.http']))
+    stats.add("d.json", make_analysis(1, ['test.slack']))
+    stats.remove("d.json")
+    
+    summary = stats.summary()
+    names, matrix = summary['co_occurrence']
+    usage = dict(summary['top_node_types'])
+    assert usage == {'test.http': 3, 'test.slack': 1, 'test.set': 1}
+    together = {(names[i], names[j]): matrix[i][j] for i in range(len(names)) for j in range(len(names))}
+    assert together[('test.http', 'test.http')] == 3
+    assert together[('test.http', 'test.slack')] == 1
+    assert together[('test.slack', 'test.set')] == 0
+
+
+def test_folders_are_grouped_by_parent_directory():
+    stats = CorpusStats()
+    stats.add("a.json", make_analysis(1))
+    stats.add("sub/b.json", make_analysis(3))
+    stats.add("sub/c.json", make_analysis(5))
+    
+    assert stats.summary()['folders'] == [('sub', 2, 8, 0), ('Root', 1, 1, 0)]
+
+
+def make_file(path, sha):
+    return WorkflowFile(name=path.rsplit('/', 1)[-1], path=path, size=1, download_url='', sha=sha)
+
+
+def test_cache_applies_recorded_analyses_without_rebuilding():
+    files = [make_file("a.json", "sha-a"), make_file("copy/a.json", "sha-a"), make_file("b.json", "sha-b")]
+    lookups = []
+    
+    def analysis_for(file):
+        lookups.append(file.path)
+        return make_analysis(2) if file.sha == "sha-a" else None
+    
+    cache = CorpusStatsCache()
+    assert cache.summary("src", files, None, analysis_for)['total_nodes'] == 4
+    built = len(lookups)
+    
+    cache.record("sha-b", make_analysis(5))
+    cache.record("sha-unlisted", make_analysis(7))
+    summary = cache.summary("src", files, None, analysis_for)
+    assert (summary['total'], summary['total_nodes']) == (3, 9)
+    assert len(lookups) == built
+    
+    # A new listing drops the removed path and looks up only the added one
+    files = [make_file("a.json", "sha-a"), make_file("b.json", "sha-b"), make_file("c.json", "sha-a")]
+    summary = cache.summary("src", files, None, analysis_for)
+    assert (summary['total'], summary['total_nodes']) == (3, 9)
+    assert lookups[built:] == ["c.json"]
+
+
+def test_cache_rebuilds_only_for_other_connections(tmp_path):
+    catalog = WorkflowCatalog(tmp_path / "catalog.sqlite3")
+    files = [make_file("a.json", "sha-a"), make_file("b.json", "sha-b")]
+    catalog.sync_files("src", files)
+    catalog.add_analysis("sha-a", make_analysis(2))
+    cache = CorpusStatsCache()
+    assert cache.summary("src", files, catalog, lambda file: None)['total'] == 1
+    
+    # Without a recorded delta, this process's own write is not picked up by a rebuild
+    catalog.add_analysis("sha-b", make_analysis(3))
+    assert cache.summary("src", files, catalog, lambda file: None)['total'] == 1
+    cache.record("sha-b", make_analysis(3))
+    assert cache.summary("src", files, catalog, lambda file: None)['total_nodes'] == 5
+    
+    # Another process rewrites an analysis, which moves data_version
+    other = sqlite3.connect(str(tmp_path / "catalog.sqlite3"))
+    with other:
+        other.execute("UPDATE analyses SET node_count = 10 WHERE sha = 'sha-b'")
+    other.close()
+    assert cache.summary("src", files, catalog, lambda file: None)['total_nodes'] == 12
@@ -0,0 +1,65 @@
+from a2pp import DuplicateIndex
+from workflow_analysis import analyze_workflow_fields, minhash_signature
+
+
+def make_workflow(types, prefix="node", offset=0):
+    """A chain of nodes of the given types; names and positions vary with prefix and offset"""
+    nodes = [{'name': f"{prefix}{i}", 'type': node_type, 'position': [offset + i * 200, 0]}
+             for i, node_type in enumerate(types)]
+    connections = {f"{prefix}{i}": {'main': [[{'node': f"{prefix}{i + 1}", 'type': 'main', 'index': 0}]]}
+                   for i in range(len(types) - 1)}
+    return {'name': prefix, 'nodes': nodes, 'connections': connections}
+
+
+BASE_TYPES = ['test.trigger'] + [f"test.step{i % 7}" for i in range(19)]
+
+
+def fingerprint(workflow):
+    fields = analyze_workflow_fields(workflow)
+    return fields['structure_hash'], fields['minhash']
+
+
+def test_structure_hash_ignores_names_and_positions():
+    assert fingerprint(make_workflow(BASE_TYPES))[0] == fingerprint(make_workflow(BASE_TYPES, "copy", 50))[0]
+    assert fingerprint(make_workflow(BASE_TYPES))[0] != fingerprint(make_workflow(BASE_TYPES + ['test.extra']))[0]
+
+
+def test_single_node_workflows_have_no_fingerprint():
+    assert fingerprint(make_workflow(['test.trigger'])) == (None, [])
+
+
+def test_minhash_estimates_jaccard_similarity():
+    left = [f"s{i}" for i in range(100)]
+    right = [f"s{i}" for i in range(50, 150)]  # Jaccard 1/3
+    agreement = sum(a == b for a, b in zip(minhash_signature(left), minhash_signature(right))) / 64
+    assert minhash_signature(left) == minhash_signature(list(reversed(left)))
+    assert abs(agreement - 1 / 3) < 0.2
+
+
+def test_groups_identical_and_near_duplicate_structures():
+    index = DuplicateIndex()
+    for path, workflow in [("a.json", make_workflow(BASE_TYPES)),
+                           ("copy/a.json", make_workflow(BASE_TYPES, "copy", 50)),
+                           ("fork.json", make_workflow(BASE_TYPES + ['test.extra'])),
+                           ("other.json", make_workflow([f"other.type{i}" for i in range(20)]))]:
+        index.add(path, *fingerprint(workflow))
+    
+    assert len(index) == 3
+    assert index.groups() == [[["a.json", "copy/a.json"], ["fork.json"]]]
+    
+    index.remove("copy/a.json")
+    index.remove("fork.json")
+    assert index.groups() == []
+
+
+def test_compares_every_pair_in_a_bucket():
+    # All three share only the first band; "a" sorts first but resembles neither of the others
+    shared = [0, 1, 2, 3]
+    b = shared + list(range(100, 160))
+    c = shared + [value + 1 if value % 4 == 0 else value for value in range(100, 160)]
+    a = shared + list(range(200, 260))
+    index = DuplicateIndex(similarity=0.5)
+    for path, signature in [("a.json", a), ("b.json", b), ("c.json", c)]:
+        index.add(path, path, signature)
+    
+    assert index.groups() == [[["b.json"], ["c.json"]]]
@@ -0,0 +1,23 @@
+from a2pp import LocalWorkflowSource, WorkflowAnalyzer, WorkflowCache
+
+DOCUMENT = b'{"name": "Indexed", "nodes": [{"name": "A", "type": "test.trigger"}], "connections": {}}'
+SHA = LocalWorkflowSource.compute_blob_sha(DOCUMENT)
+
+
+def test_entries_written_by_another_process_are_adopted(tmp_path):
+    ui = WorkflowCache(tmp_path)
+    indexer = WorkflowCache(tmp_path)
+    indexer.put(SHA, DOCUMENT, WorkflowAnalyzer.analyze_workflow(DOCUMENT))
+    
+    assert SHA in ui
+    data, analysis = ui.get(SHA)
+    assert data == DOCUMENT and analysis.name == "Indexed"
+
+
+def test_adopted_entries_count_against_the_budget(tmp_path):
+    reader = WorkflowCache(tmp_path, max_bytes=10)
+    writer = WorkflowCache(tmp_path)
+    writer.put(SHA, DOCUMENT, WorkflowAnalyzer.analyze_workflow(DOCUMENT))
+    
+    assert reader.get(SHA) is None
+    assert not (tmp_path / SHA[:2] / f"{SHA}.json").exists()
@@ -0,0 +1,70 @@
+from workflow_analysis import WorkflowGraph, analyze_workflow_fields
+
+TRIGGER = 'n8n-nodes-base.manualTrigger'
+SET = 'n8n-nodes-base.set'
+
+
+def make_graph(types, edges, attachments=()):
+    """Build a graph of nodes n0..nk with the given main edges and (sub-node, parent) ai_tool links"""
+    nodes = [{'name': f"n{i}", 'type': node_type} for i, node_type in enumerate(types)]
+    connections = {}
+    for source, target in edges:
+        outputs = connections.setdefault(f"n{source}", {}).setdefault('main', [[]])
+        outputs[0].append({'node': f"n{target}", 'type': 'main', 'index': 0})
+    for source, target in attachments:
+        outputs = connections.setdefault(f"n{source}", {}).setdefault('ai_tool', [[]])
+        outputs[0].append({'node': f"n{target}", 'type': 'ai_tool', 'index': 0})
+    return WorkflowGraph(nodes, connections)
+
+
+def test_components_come_out_in_reverse_topological_order():
+    graph = make_graph([TRIGGER, SET, SET, SET], [(0, 1), (1, 2), (2, 1), (2, 3)])
+    components = [sorted(component) for component in graph._strongly_connected_components()]
+    assert components == [[3], [1, 2], [0]]
+
+
+def test_chain_depth_and_no_cycles():
+    metrics = make_graph([TRIGGER, SET, SET], [(0, 1), (1, 2)]).metrics()
+    assert metrics.max_depth == 2
+    assert metrics.cycle_count == 0
+    assert metrics.edge_count == 2
+
+
+def test_cycles_collapse_into_one_depth_step():
+    # n1 <-> n2 is one component, so the longest path is n0 -> {n1, n2} -> n3
+    metrics = make_graph([TRIGGER, SET, SET, SET], [(0, 1), (1, 2), (2, 1), (2, 3)]).metrics()
+    assert metrics.cycle_count == 1
+    assert metrics.max_depth == 2
+
+
+def test_self_loop_counts_as_cycle():
+    metrics = make_graph([TRIGGER, SET], [(0, 1), (1, 1)]).metrics()
+    assert metrics.cycle_count == 1
+    assert metrics.max_depth == 1
+
+
+def test_long_chain_does_not_recurse():
+    length = 5000
+    metrics = make_graph([TRIGGER] + [SET] * (length - 1), [(i, i + 1) for i in range(length - 1)]).metrics()
+    assert metrics.max_depth == length - 1
+
+
+def test_orphans_and_reachability_follow_attachments():
+    # n2 is a tool attached to n1, n3 is disconnected
+    graph = make_graph([TRIGGER, SET, 'tool', SET], [(0, 1)], attachments=[(2, 1)])
+    metrics = graph.metrics()
+    assert metrics.orphan_count == 1
+    assert metrics.unreachable_count == 1
+
+
+def test_analysis_fields_include_graph_metrics():
+    workflow = {
+        'name': 'Example',
+        'nodes': [{'name': 'Start', 'type': TRIGGER}, {'name': 'Set', 'type': SET}],
+        'connections': {'Start': {'main': [[{'node': 'Set', 'type': 'main', 'index': 0}]]}},
+    }
+    fields = analyze_workflow_fields(workflow)
+    assert fields['node_count'] == 2
+    assert fields['connection_count'] == 1
+    assert fields['has_trigger'] is True
+    assert fields['max_depth'] == 1
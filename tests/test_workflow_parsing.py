@@ -0,0 +1,64 @@
+import io
+import json
+
+import pytest
+
+from a2pp import JSON_ERRORS, LARGE_WORKFLOW_BYTES, SUMMARY_MARKER, SUMMARY_NOTE_MAX_CHARS, WorkflowAnalyzer
+
+
+def make_large_workflow():
+    """A workflow over LARGE_WORKFLOW_BYTES, almost all of it pinned data the summary drops"""
+    nodes = [
+        {'name': 'Trigger', 'type': 'n8n-nodes-base.manualTrigger', 'position': [0, 0], 'parameters': {}},
+        {'name': 'Fetch', 'type': 'n8n-nodes-base.httpRequest', 'position': [200, 0],
+         'parameters': {'url': 'https://example.com', 'options': {'timeout': 30}}},
+        {'name': 'Note', 'type': WorkflowAnalyzer.STICKY_NOTE_TYPE, 'position': [0, 200],
+         'parameters': {'content': 'x' * (SUMMARY_NOTE_MAX_CHARS + 100)}},
+    ]
+    connections = {'Trigger': {'main': [[{'node': 'Fetch', 'type': 'main', 'index': 0}]]}}
+    rows = [{'json': {'id': i, 'payload': 'y' * 200}} for i in range(LARGE_WORKFLOW_BYTES // 200 + 1)]
+    return {'id': 'abc', 'name': 'Large', 'createdAt': '2024-01-01T00:00:00.000Z', 'active': False,
+            'tags': [{'id': '1', 'name': 'big'}], 'nodes': nodes, 'connections': connections,
+            'pinData': {'Fetch': rows}, 'staticData': {'seen': list(range(100))}}
+
+
+def test_stream_summary_matches_in_memory_summary():
+    workflow = make_large_workflow()
+    content = json.dumps(workflow).encode("utf-8")
+    assert len(content) > LARGE_WORKFLOW_BYTES
+    
+    streamed = WorkflowAnalyzer._summarize_stream(io.BytesIO(content))
+    assert streamed == WorkflowAnalyzer.summarize(workflow)
+    assert 'pinData' not in streamed and 'staticData' not in streamed
+    assert len(streamed['nodes'][2]['parameters']['content']) == SUMMARY_NOTE_MAX_CHARS
+
+
+def test_parse_workflow_only_summarizes_large_documents():
+    small = {'name': 'Small', 'nodes': [], 'connections': {}, 'pinData': {'Fetch': []}}
+    parsed = WorkflowAnalyzer.parse_workflow(io.BytesIO(json.dumps(small).encode("utf-8")), 100)
+    assert parsed == small and not WorkflowAnalyzer.is_summary(parsed)
+    
+    content = json.dumps(make_large_workflow()).encode("utf-8")
+    summary = WorkflowAnalyzer.parse_workflow(io.BytesIO(content), len(content))
+    assert summary[SUMMARY_MARKER] and WorkflowAnalyzer.is_summary(summary)
+
+
+def test_summary_analyzes_like_the_full_workflow():
+    workflow = make_large_workflow()
+    full = WorkflowAnalyzer.analyze_workflow(workflow)
+    summarized = WorkflowAnalyzer.analyze_workflow(WorkflowAnalyzer.summarize(workflow))
+    assert (summarized.node_count, summarized.connection_count, summarized.has_trigger) == \
+        (full.node_count, full.connection_count, full.has_trigger)
+    assert summarized.node_types == full.node_types and summarized.tags == full.tags
+
+
+def test_raw_documents_are_parsed_on_demand():
+    assert WorkflowAnalyzer.parse_document(b'{"name": "Raw"}') == {'name': 'Raw'}
+    document = {'name': 'Parsed'}
+    assert WorkflowAnalyzer.parse_document(document) is document
+
+
+@pytest.mark.parametrize("content", [b'{"nodes": [', b'not json'])
+def test_malformed_large_documents_raise(content):
+    with pytest.raises(JSON_ERRORS):
+        WorkflowAnalyzer._summarize_stream(io.BytesIO(content))
@@ -0,0 +1,282 @@
+"""Workflow analysis that does not depend on Streamlit, so it can run in worker processes"""
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+TRIGGER_WORDS = ('trigger', 'webhook', 'cron', 'interval')
+FAN_OUT_HOTSPOT_DEGREE = 4
+STICKY_NOTE_TYPE = 'n8n-nodes-base.stickyNote'
+
+# Structural fingerprints
+FINGERPRINT_MIN_NODES = 2  # Single-node workflows are too small to call duplicates
+MINHASH_PERMUTATIONS = 64
+MINHASH_PRIME = 4294967291  # Largest prime below 2**32, so a * h + b stays within uint64
+
+def _seeded_coefficients(label: str, low: int) -> np.ndarray:
+    """Derive permutation coefficients from fixed labels, so signatures agree across processes and NumPy versions"""
+    return np.array([low + int.from_bytes(hashlib.blake2b(f"{label}{i}".encode(), digest_size=8).digest(), "little")
+                     % (MINHASH_PRIME - low) for i in range(MINHASH_PERMUTATIONS)], dtype=np.uint64)
+
+MINHASH_A = _seeded_coefficients("a", 1)
+MINHASH_B = _seeded_coefficients("b", 0)
+
+def minhash_signature(shingles: List[str]) -> List[int]:
+    """Return the 32-bit MinHash signature of a set of shingles"""
+    hashes = np.fromiter((int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), "little")
+                          for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    permuted = (MINHASH_A[:, None] * hashes[None, :] + MINHASH_B[:, None]) % np.uint64(MINHASH_PRIME)
+    return permuted.min(axis=1).tolist()
+
+@dataclass(frozen=True, slots=True)
+class GraphMetrics:
+    """Data class to represent structural metrics of a workflow graph"""
+    edge_count: int
+    max_depth: int
+    cycle_count: int
+    orphan_count: int
+    unreachable_count: int
+    max_fan_out: int
+    fan_out_hotspots: Tuple[str, ...]
+
+class WorkflowGraph:
+    """Class to build an adjacency structure from n8n connections and compute structural metrics in linear time"""
+    
+    def __init__(self, nodes: List[Dict[str, Any]], connections: Dict[str, Any]):
+        self.names: List[str] = []
+        self.types: List[str] = []
+        index: Dict[str, int] = {}
+        for node in nodes:
+            name = node.get('name')
+            if name is None or name in index:
+                continue
+            index[name] = len(self.names)
+            self.names.append(name)
+            self.types.append(node.get('type', 'unknown'))
+        
+        node_count = len(self.names)
+        self.main_edges: List[List[int]] = [[] for _ in range(node_count)]
+        # ai_* outputs point from sub-nodes (models, tools, memory) into the node that uses them
+        self.attachments: List[List[int]] = [[] for _ in range(node_count)]
+        self.in_degree = [0] * node_count
+        self.out_degree = [0] * node_count
+        self.edge_count = 0
+        
+        # connections: {source: {output_type: [[{node, type, index}, ...] per output branch]}}
+        for source_name, outputs in (connections or {}).items():
+            source = index.get(source_name)
+            if source is None or not isinstance(outputs, dict):
+                continue
+            for output_type, branches in outputs.items():
+                for branch in branches or []:
+                    for connection in branch or []:
+                        target = index.get((connection or {}).get('node'))
+                        if target is None:
+                            continue
+                        if output_type == 'main':
+                            self.main_edges[source].append(target)
+                        else:
+                            self.attachments[target].append(source)
+                        self.out_degree[source] += 1
+                        self.in_degree[target] += 1
+                        self.edge_count += 1
+    
+    @staticmethod
+    def is_trigger_type(node_type: str) -> bool:
+        node_type = node_type.lower()
+        return any(trigger_word in node_type for trigger_word in TRIGGER_WORDS)
+    
+    def _strongly_connected_components(self) -> List[List[int]]:
+        """Iterative Tarjan over main edges; components come out in reverse topological order"""
+        node_count = len(self.names)
+        order = [-1] * node_count
+        low = [0] * node_count
+        on_stack = [False] * node_count
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+        
+        for root in range(node_count):
+            if order[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge_position = work.pop()
+                if edge_position == 0:
+                    order[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                
+                recursed = False
+                edges = self.main_edges[node]
+                while edge_position < len(edges):
+                    target = edges[edge_position]
+                    edge_position += 1
+                    if order[target] == -1:
+                        work.append((node, edge_position))
+                        work.append((target, 0))
+                        recursed = True
+                        break
+                    if on_stack[target]:
+                        low[node] = min(low[node], order[target])
+                if recursed:
+                    continue
+                
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+                
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+        
+        return components
+    
+    def shingles(self) -> List[str]:
+        """Structural tokens for node types and typed edges, ignoring names, ids, positions and sticky notes"""
+        types = self.types
+        tokens = [f"node:{node_type}" for node_type in types if node_type != STICKY_NOTE_TYPE]
+        for source, targets in enumerate(self.main_edges):
+            tokens.extend(f"main:{types[source]}>{types[target]}" for target in targets)
+        for target, sources in enumerate(self.attachments):
+            tokens.extend(f"attach:{types[source]}>{types[target]}" for source in sources)
+        
+        # Repeated tokens are numbered, so the set still describes the multiset of nodes and edges
+        seen: Dict[str, int] = {}
+        shingles = []
+        for token in tokens:
+            occurrence = seen.get(token, 0)
+            seen[token] = occurrence + 1
+            shingles.append(f"{token}#{occurrence}")
+        return shingles
+    
+    def fingerprint(self) -> Tuple[Optional[str], List[int]]:
+        """Return (canonical structure hash, MinHash signature), or (None, []) for trivial workflows"""
+        shingles = self.shingles()
+        if sum(1 for shingle in shingles if shingle.startswith("node:")) < FINGERPRINT_MIN_NODES:
+            return None, []
+        structure_hash = hashlib.sha1("\n".join(sorted(shingles)).encode("utf-8")).hexdigest()
+        return structure_hash, minhash_signature(shingles)
+    
+    def metrics(self) -> GraphMetrics:
+        node_count = len(self.names)
+        is_sticky = [node_type == STICKY_NOTE_TYPE for node_type in self.types]
+        
+        # Cycles and longest path over the condensation of main edges
+        components = self._strongly_connected_components()
+        component_of = [0] * node_count
+        for component_id, component in enumerate(components):
+            for node in component:
+                component_of[node] = component_id
+        
+        cycle_count = 0
+        depth = [0] * len(components)
+        # Reverse topological order means every successor component is finalized first
+        for component_id, component in enumerate(components):
+            if len(component) > 1 or component[0] in self.main_edges[component[0]]:
+                cycle_count += 1
+            for node in component:
+                for target in self.main_edges[node]:
+                    target_component = component_of[target]
+                    if target_component != component_id:
+                        depth[component_id] = max(depth[component_id], depth[target_component] + 1)
+        
+        # Reachability from triggers, following main edges forward and attachments back to sub-nodes
+        reachable = [False] * node_count
+        frontier = [node for node in range(node_count) if self.is_trigger_type(self.types[node])]
+        for node in frontier:
+            reachable[node] = True
+        while frontier:
+            node = frontier.pop()
+            for target in self.main_edges[node] + self.attachments[node]:
+                if not reachable[target]:
+                    reachable[target] = True
+                    frontier.append(target)
+        
+        orphan_count = sum(1 for node in range(node_count)
+                           if not is_sticky[node] and self.in_degree[node] == 0 and self.out_degree[node] == 0)
+        unreachable_count = sum(1 for node in range(node_count) if not is_sticky[node] and not reachable[node])
+        
+        hotspots = sorted((node for node in range(node_count) if self.out_degree[node] >= FAN_OUT_HOTSPOT_DEGREE),
+                          key=lambda node: self.out_degree[node], reverse=True)
+        
+        return GraphMetrics(
+            edge_count=self.edge_count,
+            max_depth=max(depth, default=0),
+            cycle_count=cycle_count,
+            orphan_count=orphan_count,
+            unreachable_count=unreachable_count,
+            max_fan_out=max(self.out_degree, default=0),
+            fan_out_hotspots=tuple(self.names[node] for node in hotspots[:5])
+        )
+
+def analyze_workflow_fields(workflow_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze workflow data and return the fields of a WorkflowAnalysis, with node types as names"""
+    nodes = workflow_data.get('nodes', [])
+    connections = workflow_data.get('connections', {})
+    
+    # Basic counts and structure
+    node_count = len(nodes)
+    graph = WorkflowGraph(nodes, connections)
+    graph_metrics = graph.metrics()
+    structure_hash, minhash = graph.fingerprint()
+    
+    # Node type analysis
+    node_types = []
+    sticky_notes = []
+    has_trigger = False
+    
+    for node in nodes:
+        node_type = node.get('type', 'unknown')
+        if node_type not in node_types:
+            node_types.append(node_type)
+        
+        if node_type == STICKY_NOTE_TYPE:
+            content = (node.get('parameters') or {}).get('content')
+            if content:
+                sticky_notes.append(content)
+        
+        # Check for triggers
+        if WorkflowGraph.is_trigger_type(node_type):
+            has_trigger = True
+    
+    # Extract metadata
+    name = workflow_data.get('name', 'Unnamed Workflow')
+    created_at = workflow_data.get('createdAt')
+    updated_at = workflow_data.get('updatedAt')
+    tags = workflow_data.get('tags', [])
+    description = workflow_data.get('notes') or workflow_data.get('description')
+    
+    return dict(
+        name=name,
+        node_count=node_count,
+        connection_count=graph_metrics.edge_count,
+        has_trigger=has_trigger,
+        node_types=node_types,
+        created_at=created_at,
+        updated_at=updated_at,
+        tags=tags,
+        description=description,
+        sticky_notes=sticky_notes,
+        max_depth=graph_metrics.max_depth,
+        cycle_count=graph_metrics.cycle_count,
+        orphan_count=graph_metrics.orphan_count,
+        unreachable_count=graph_metrics.unreachable_count,
+        max_fan_out=graph_metrics.max_fan_out,
+        fan_out_hotspots=graph_metrics.fan_out_hotspots,
+        structure_hash=structure_hash,
+        minhash=minhash
+    )
+
+def analyze_workflow_content(content: bytes) -> Dict[str, Any]:
+    """Parse raw workflow bytes and return their analysis fields; the parsed document never leaves the worker"""
+    return analyze_workflow_fields(json.loads(content))